@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for Document Summarizer application
+Run `python benchmark.py <name>` to time a component, or `python benchmark.py --help` to list them
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+SAMPLE_TEXT = (
+    "Quarterly revenue grew by twelve percent compared with the previous year. "
+    "The growth was driven mainly by subscription renewals in the enterprise segment. "
+    "Operating costs remained flat despite new hiring in the support team. "
+    "Management expects similar growth in the next quarter if renewals continue. "
+    "The board approved a new budget for research and development. "
+    "Several smaller customers migrated to the annual plan during the period. "
+    "Cash reserves are sufficient to cover planned investments for two years. "
+)
+
+def _time_calls(func, repeat):
+    """Run func repeat times and return per-call durations in seconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+def _report(label, durations):
+    """Print median and mean per-call time in milliseconds."""
+    print(f"{label:<40} median {statistics.median(durations) * 1000:8.3f} ms"
+          f"   mean {statistics.mean(durations) * 1000:8.3f} ms   ({len(durations)} calls)")
+
+def bench_context(args):
+    """Per-call overhead of summarizing small documents with and without a shared SummarizerContext."""
+    import summarizer
+
+    text = SAMPLE_TEXT * args.copies
+    summarizer.get_context()  # load NLTK data outside the timed region
+
+    before = _time_calls(lambda: summarizer.extractive_summary(
+        text, 3, context=summarizer.SummarizerContext()), args.repeat)
+    after = _time_calls(lambda: summarizer.extractive_summary(text, 3), args.repeat)
+
+    print(f"\nSmall-document summarization ({len(text)} chars):")
+    _report("context rebuilt per call (before)", before)
+    _report("shared process context (after)", after)
+    print(f"Speedup: {statistics.median(before) / statistics.median(after):.1f}x")
+
+def _word_f1(reference, candidate):
+    """Bag-of-words F1 between two extracted texts (1.0 = same words, any order)."""
+    from collections import Counter
+
+    reference_words = Counter(reference.lower().split())
+    candidate_words = Counter(candidate.lower().split())
+    overlap = sum((reference_words & candidate_words).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(candidate_words.values())
+    recall = overlap / sum(reference_words.values())
+    return 2 * precision * recall / (precision + recall)
+
+def bench_pdf_backends(args):
+    """Pages/second and text fidelity (vs pdfplumber) of each registered PDF backend on a folder of PDFs."""
+    import os
+    import file_handler
+
+    pdf_paths = sorted(os.path.join(args.corpus, name) for name in os.listdir(args.corpus)
+                       if name.lower().endswith(".pdf"))
+    if not pdf_paths:
+        print(f"No PDF files found in {args.corpus}")
+        return 1
+
+    reference = {}
+    print(f"\nPDF backends on {len(pdf_paths)} files from {args.corpus}:")
+    for backend in sorted(file_handler.PDF_BACKENDS, key=lambda name: name != "pdfplumber"):
+        pages = 0
+        scores = []
+        start = time.perf_counter()
+        for path in pdf_paths:
+            page_texts = list(file_handler.iter_pdf_pages(path, backend=backend))
+            pages += len(page_texts)
+            text = "\n".join(page_texts)
+            reference.setdefault(path, text)
+            scores.append(_word_f1(reference[path], text))
+        elapsed = time.perf_counter() - start
+        print(f"{backend:<12} {pages / elapsed:10.1f} pages/s   word F1 vs pdfplumber {statistics.mean(scores):.3f}")
+
+def _summary_table(metadata, name="summary"):
+    """Mirror of the web_app Summary table, so benchmarks never touch the application's own table."""
+    from sqlalchemy import Column, Float, Integer, String, Table, Text
+
+    return Table(name, metadata,
+                 Column("id", Integer, primary_key=True),
+                 Column("user_id", Integer, nullable=False, index=True),
+                 Column("file_name", String(255), nullable=False),
+                 Column("summary_text", Text, nullable=False),
+                 Column("created_at", Float))
+
+def _db_worker(database_uri, profile, operations, read_ratio, worker_id):
+    """Process pool task: mixed Summary inserts (one transaction each) and history reads."""
+    import random
+    from sqlalchemy import MetaData, create_engine, select
+    from sqlalchemy.exc import OperationalError
+    import storage
+
+    config = {"SQLITE_PROFILE": profile}
+    engine = create_engine(database_uri, **storage.engine_options(database_uri, config))
+    storage.apply_sqlite_profile(engine, storage.sqlite_pragmas(config))
+    summary = _summary_table(MetaData())
+    rng = random.Random(worker_id)
+    errors = 0
+    for index in range(operations):
+        user_id = rng.randint(1, 50)
+        try:
+            if rng.random() < read_ratio:
+                with engine.connect() as connection:
+                    connection.execute(select(summary.c.id, summary.c.file_name)
+                                       .where(summary.c.user_id == user_id)
+                                       .order_by(summary.c.id.desc()).limit(20)).all()
+            else:
+                with engine.begin() as connection:
+                    connection.execute(summary.insert().values(
+                        user_id=user_id, file_name=f"worker{worker_id}-{index}.pdf",
+                        summary_text=SAMPLE_TEXT, created_at=time.time()))
+        except OperationalError:
+            errors += 1
+    engine.dispose()
+    return errors
+
+def bench_db_concurrency(args):
+    """Throughput of parallel Summary inserts and reads from several processes for each SQLite profile."""
+    import os
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+    from sqlalchemy import MetaData, create_engine
+    import storage
+
+    print(f"\n{args.workers} processes x {args.operations} operations ({args.read_ratio:.0%} reads):")
+    for profile in storage.SQLITE_PROFILES:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            database_uri = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+            engine = create_engine(database_uri)
+            metadata = MetaData()
+            _summary_table(metadata)
+            metadata.create_all(engine)
+            engine.dispose()
+
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=args.workers) as executor:
+                errors = sum(executor.map(_db_worker, [database_uri] * args.workers, [profile] * args.workers,
+                                          [args.operations] * args.workers, [args.read_ratio] * args.workers,
+                                          range(args.workers)))
+            elapsed = time.perf_counter() - start
+        total = args.workers * args.operations
+        print(f"{profile:<12} {total / elapsed:10.1f} ops/s   {errors} failed (database is locked)")
+
+def bench_bulk_insert(args):
+    """Load test: insert many Summary rows through SummaryRepository.bulk_insert vs one commit per row."""
+    import os
+    import tempfile
+    from sqlalchemy import MetaData, create_engine, insert
+    from sqlalchemy.orm import Session
+    import storage
+    from repository import SummaryRepository
+
+    def make_rows(count, prefix):
+        now = time.time()
+        return ({"user_id": index % 50 + 1, "file_name": f"{prefix}-{index}.pdf",
+                 "summary_text": SAMPLE_TEXT, "created_at": now} for index in range(count))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_uri = storage.normalize_database_url(
+            args.database_uri or f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        config = {"SQLITE_PROFILE": args.profile}
+        engine = create_engine(database_uri, **storage.engine_options(database_uri, config))
+        storage.apply_sqlite_profile(engine, storage.sqlite_pragmas(config))
+        metadata = MetaData()
+        summary = _summary_table(metadata, "bench_summary")
+        metadata.drop_all(engine)
+        metadata.create_all(engine)
+
+        print(f"\nSummary inserts on {engine.dialect.name} ({database_uri.split('@')[-1]}):")
+        with Session(engine) as session:
+            start = time.perf_counter()
+            for row in make_rows(args.baseline_rows, "single"):
+                session.execute(insert(summary), row)
+                session.commit()
+            elapsed = time.perf_counter() - start
+        print(f"{'commit per row':<24} {args.baseline_rows:>8} rows {elapsed:8.2f} s "
+              f"{args.baseline_rows / elapsed:12.0f} rows/s")
+
+        with Session(engine) as session:
+            repository = SummaryRepository(session, summary)
+            start = time.perf_counter()
+            inserted = repository.bulk_insert(make_rows(args.rows, "bulk"), batch_size=args.batch_size)
+            elapsed = time.perf_counter() - start
+        print(f"{'bulk_insert (1 txn)':<24} {inserted:>8} rows {elapsed:8.2f} s {inserted / elapsed:12.0f} rows/s")
+        metadata.drop_all(engine)
+        engine.dispose()
+
+def _upload_client(url, username, password, payload, file_name, uploads):
+    """Thread task: log in with its own session cookie, then post uploads and time each request."""
+    import http.cookiejar
+    import urllib.parse
+    import urllib.request
+    import uuid
+
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    credentials = urllib.parse.urlencode({"username": username, "password": password}).encode()
+    opener.open(f"{url}/login", credentials).close()
+
+    boundary = uuid.uuid4().hex
+    fields = {"summary_type": "extractive", "num_sentences": "5", "max_length": "150"}
+    body = b"".join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        for name, value in fields.items())
+    body += (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{file_name}"\r\n'
+             f"Content-Type: application/octet-stream\r\n\r\n").encode() + payload + f"\r\n--{boundary}--\r\n".encode()
+    headers = {"Content-Type": f"multipart/form-data; boundary={boundary}", "Accept": "application/json"}
+
+    durations, failures = [], 0
+    for _ in range(uploads):
+        start = time.perf_counter()
+        try:
+            with opener.open(urllib.request.Request(f"{url}/", body, headers)) as response:
+                response.read()
+                if response.status != 202:
+                    failures += 1
+        except OSError:
+            failures += 1
+        durations.append(time.perf_counter() - start)
+    return durations, failures
+
+def bench_upload_throughput(args):
+    """Uploads/second accepted by a running server (e.g. gunicorn -c gunicorn.conf.py wsgi:app) under concurrent clients."""
+    import os
+    from concurrent.futures import ThreadPoolExecutor
+
+    if args.file:
+        with open(args.file, "rb") as file:
+            payload = file.read()
+        file_name = os.path.basename(args.file)
+    else:
+        payload = (SAMPLE_TEXT * args.copies).encode()
+        file_name = "sample.txt"
+
+    url = args.url.rstrip("/")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as executor:
+        results = list(executor.map(
+            lambda _: _upload_client(url, args.username, args.password, payload, file_name, args.uploads),
+            range(args.clients)))
+    elapsed = time.perf_counter() - start
+
+    durations = [duration for client_durations, _ in results for duration in client_durations]
+    failures = sum(client_failures for _, client_failures in results)
+    print(f"\n{len(durations)} uploads of {len(payload)} bytes from {args.clients} clients to {url}:")
+    _report("upload request", durations)
+    print(f"p95 {statistics.quantiles(durations, n=20)[-1] * 1000:.1f} ms   failures {failures}")
+    print(f"Throughput: {len(durations) / elapsed:.1f} uploads/s "
+          f"({len(durations) * len(payload) / elapsed / (1024 * 1024):.2f} MB/s)")
+
+def _extract_txt_multi_pass(txt_path):
+    """extract_text_from_txt before single-pass detection: re-read the whole file per encoding."""
+    for encoding in ['utf-8', 'latin-1', 'utf-16']:
+        try:
+            with open(txt_path, "r", encoding=encoding) as file:
+                return file.read().strip()
+        except Exception:
+            continue
+
+def _txt_worker(method, txt_path):
+    """Process pool task: decode a file with one method, returning (seconds, peak RSS in MB, text length, sample)."""
+    import resource
+
+    import file_handler
+
+    start = time.perf_counter()
+    if method == "multi-pass":
+        text = _extract_txt_multi_pass(txt_path)
+    elif method == "single-pass":
+        text = file_handler.extract_text_from_txt(txt_path)
+    else:
+        length, sample = 0, ""
+        for chunk in file_handler.iter_txt_chunks(txt_path):
+            length += len(chunk)
+            sample = sample or chunk[:40]
+        return time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, length, sample
+    return (time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            len(text), text[:40])
+
+def bench_txt_encoding(args):
+    """Time and peak memory of decoding large TXT files in several encodings, multi-pass vs single-pass vs streamed."""
+    import os
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    line = "Grüße aus Köln: the café served crème brûlée to 42 guests.\n"
+    repeats = args.size_mb * 1024 * 1024 // len(line.encode("utf-8"))
+    with tempfile.TemporaryDirectory() as folder:
+        for encoding in ["utf-8", "cp1252", "utf-16"]:
+            txt_path = os.path.join(folder, f"sample-{encoding}.txt")
+            with open(txt_path, "w", encoding=encoding, newline="") as file:
+                for _ in range(repeats // 10000):
+                    file.write(line * 10000)
+            size_mb = os.path.getsize(txt_path) / (1024 * 1024)
+            print(f"\n{encoding} file, {size_mb:.0f} MB:")
+            for method in ["multi-pass", "single-pass", "streamed"]:
+                # A fresh process per run, so peak RSS belongs to that method alone
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    elapsed, peak_mb, length, sample = executor.submit(_txt_worker, method, txt_path).result()
+                correct = sample == line[:len(sample)]
+                print(f"  {method:<12} {elapsed:7.2f} s  {size_mb / elapsed:7.1f} MB/s  peak RSS {peak_mb:7.0f} MB"
+                      f"  {'ok' if correct else 'GARBLED'}  ({length} chars)")
+
+def _large_txt_worker(method, txt_path, num_sentences):
+    """Process pool task: summarize a TXT file with one method, returning (seconds, peak RSS in MB, summary)."""
+    import resource
+
+    import file_handler
+    import summarizer
+
+    summarizer.get_context()
+    start = time.perf_counter()
+    if method == "in-memory":
+        summary = summarizer.extractive_summary(file_handler.extract_text_from_txt(txt_path), num_sentences)
+    else:
+        summary = summarizer.extractive_summary_two_pass(lambda: file_handler.iter_txt_chunks(txt_path), num_sentences)
+    return time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, summary
+
+def bench_large_txt(args):
+    """Peak memory and time of extractive summaries of large TXT files, in memory vs two passes over an mmap."""
+    import os
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    with tempfile.TemporaryDirectory() as folder:
+        for size_mb in args.sizes_mb:
+            txt_path = os.path.join(folder, f"sample-{size_mb}.txt")
+            with open(txt_path, "w", encoding="utf-8") as file:
+                for _ in range(size_mb * 1024 * 1024 // (len(SAMPLE_TEXT) * 100)):
+                    file.write(SAMPLE_TEXT * 100 + "\n")
+            print(f"\n{size_mb} MB TXT file:")
+            summaries = {}
+            for method in (["in-memory", "two-pass"] if size_mb <= args.max_in_memory_mb else ["two-pass"]):
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    elapsed, peak_mb, summaries[method] = executor.submit(
+                        _large_txt_worker, method, txt_path, args.sentences).result()
+                print(f"  {method:<10} {elapsed:7.2f} s  {size_mb / elapsed:6.1f} MB/s  peak RSS {peak_mb:7.0f} MB")
+            if len(summaries) == 2:
+                print(f"  summaries identical: {summaries['in-memory'] == summaries['two-pass']}")
+
+def _docx_worker(method, docx_path):
+    """Process pool task: extract a DOCX with one method, returning (seconds, peak RSS in MB, text length)."""
+    import resource
+
+    import file_handler
+
+    extract = {"python-docx": lambda path: "\n".join(file_handler._iter_docx_paragraphs_python_docx(path)),
+               "streaming": file_handler.extract_text_from_docx}[method]
+    start = time.perf_counter()
+    text = extract(docx_path)
+    return time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, len(text)
+
+def bench_docx(args):
+    """Speed and peak memory of DOCX extraction: python-docx object model vs streaming the document XML."""
+    import os
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    from docx import Document
+
+    with tempfile.TemporaryDirectory() as folder:
+        docx_path = os.path.join(folder, "contract.docx")
+        document = Document()
+        for page in range(args.pages):
+            document.add_heading(f"Section {page + 1}", level=1)
+            for _ in range(10):
+                document.add_paragraph(SAMPLE_TEXT)
+            table = document.add_table(rows=3, cols=2)
+            for row in table.rows:
+                row.cells[0].text = "Clause"
+                row.cells[1].text = SAMPLE_TEXT[:80]
+        document.save(docx_path)
+        print(f"\n{args.pages}-page DOCX, {os.path.getsize(docx_path) / (1024 * 1024):.1f} MB:")
+        for method in ["python-docx", "streaming"]:
+            # A fresh process per run, so peak RSS belongs to that method alone
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                elapsed, peak_mb, length = executor.submit(_docx_worker, method, docx_path).result()
+            print(f"  {method:<12} {elapsed:7.2f} s  peak RSS {peak_mb:6.0f} MB  ({length} chars)")
+
+def _synthetic_document(sentence_count, vocabulary_size=30000, seed=0):
+    """Sentences of Zipf-distributed made-up words, roughly like the term statistics of real prose."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    probabilities = 1 / np.arange(1, vocabulary_size + 1) ** 1.07
+    probabilities /= probabilities.sum()
+    lengths = rng.integers(8, 30, sentence_count)
+    words = rng.choice(vocabulary_size, lengths.sum(), p=probabilities)
+    sentences = []
+    position = 0
+    for length in lengths:
+        sentences.append("The " + " ".join(f"term{word}" for word in words[position:position + length]) + ".")
+        position += length
+    return " ".join(sentences)
+
+def _naive_textrank_scores(token_lists, stop_words):
+    """TextRank with a dense n x n similarity matrix and dense power iteration (the O(n^2) memory baseline)."""
+    import numpy as np
+
+    import summarizer
+
+    vectors = summarizer.tfidf_matrix(token_lists, stop_words).toarray()
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0)
+    similarity[similarity < summarizer.TEXTRANK_THRESHOLD] = 0
+    count = len(similarity)
+    out_weight = similarity.sum(axis=1)
+    transition = np.where(out_weight[:, None] > 0, similarity / np.where(out_weight > 0, out_weight, 1)[:, None],
+                          1 / count).T
+    ranks = np.full(count, 1 / count)
+    for _ in range(100):
+        ranks = summarizer.TEXTRANK_DAMPING * (transition @ ranks) + (1 - summarizer.TEXTRANK_DAMPING) / count
+    return ranks
+
+def bench_textrank(args):
+    """Time of TextRank sentence scoring on synthetic documents: sparse top-k graph vs a dense O(n^2) graph."""
+    import summarizer
+
+    context = summarizer.get_context()
+    for sentence_count in args.sentences:
+        document = summarizer.tokenize_document(_synthetic_document(sentence_count), context)
+        document.tokens
+        print(f"\n{len(document)} sentences:")
+        start = time.perf_counter()
+        summarizer.score_sentences(document.tokens, context.stop_words)
+        print(f"  {'frequency':<16} {time.perf_counter() - start:7.2f} s")
+        start = time.perf_counter()
+        sparse = summarizer.select_top_sentences(summarizer.textrank_scores(document.tokens, context.stop_words),
+                                                 args.top)
+        print(f"  {'textrank sparse':<16} {time.perf_counter() - start:7.2f} s")
+        if len(document) > args.max_naive:
+            print(f"  {'textrank dense':<16} skipped (more than --max-naive {args.max_naive} sentences)")
+            continue
+        start = time.perf_counter()
+        dense = summarizer.select_top_sentences(_naive_textrank_scores(document.tokens, context.stop_words), args.top)
+        print(f"  {'textrank dense':<16} {time.perf_counter() - start:7.2f} s  "
+              f"({len(set(sparse) & set(dense))} of top {args.top} sentences shared with sparse)")
+
+BENCHMARKS = {
+    "context": (bench_context, [("--copies", int, 1), ("--repeat", int, 200)]),
+    "pdf-backends": (bench_pdf_backends, [("--corpus", str, "instance/uploads")]),
+    "db-concurrency": (bench_db_concurrency, [("--workers", int, 8), ("--operations", int, 500),
+                                              ("--read-ratio", float, 0.5)]),
+    "bulk-insert": (bench_bulk_insert, [("--rows", int, 100000), ("--baseline-rows", int, 2000),
+                                        ("--batch-size", int, 5000), ("--profile", str, "concurrent"),
+                                        ("--database-uri", str, None)]),
+    "upload-throughput": (bench_upload_throughput, [("--url", str, "http://127.0.0.1:8000"), ("--clients", int, 8),
+                                                    ("--uploads", int, 25), ("--file", str, None),
+                                                    ("--copies", int, 50), ("--username", str, "demo"),
+                                                    ("--password", str, "demo123")]),
+    "txt-encoding": (bench_txt_encoding, [("--size-mb", int, 300)]),
+    "large-txt": (bench_large_txt, [("--sizes-mb", int, [50, 200, 1000]), ("--sentences", int, 5),
+                                    ("--max-in-memory-mb", int, 200)]),
+    "docx": (bench_docx, [("--pages", int, 500)]),
+    "textrank": (bench_textrank, [("--sentences", int, [2000, 20000]), ("--top", int, 10),
+                                  ("--max-naive", int, 10000)]),
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Document Summarizer benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    for name, (func, options) in BENCHMARKS.items():
+        subparser = subparsers.add_parser(name, help=func.__doc__)
+        for flag, kind, default in options:
+            subparser.add_argument(flag, type=kind, default=default, nargs="+" if isinstance(default, list) else None)
+        subparser.set_defaults(func=func)
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,76 +1,938 @@
+import codecs
+import hashlib
+import io
+import json
+import mmap
 import os
-import traceback
+import posixpath
+import re
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+import zlib
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+from importlib.util import find_spec
 
+# Extraction libraries are only located here and imported on first use, keeping startup
+# fast; detect_backends() sets these flags (again after packages are installed at startup)
+PDFPLUMBER_AVAILABLE = PDFMINER_AVAILABLE = PYPDF_AVAILABLE = DOCX_AVAILABLE = False
 
-try:
+class ExtractionError(Exception):
+    """Why text could not be extracted from a file."""
+
+class UnsupportedFileError(ExtractionError):
+    """No extractor is registered for the file's type."""
+
+class BackendUnavailableError(ExtractionError):
+    """The library needed for the file (or the requested PDF backend) is not installed."""
+
+class NoTextError(ExtractionError):
+    """The file was read but holds (almost) no text, e.g. a scanned PDF."""
+
+class ExtractionLimitError(ExtractionError):
+    """Extraction was stopped for exceeding its time or memory limit."""
+
+# Extracted text shorter than this (ignoring whitespace) is reported as NoTextError
+MIN_TEXT_CHARS = 20
+NON_SPACE_RE = re.compile(r"\S")
+
+class ExtractionResult:
+    """Text extracted from one file, or the reason there is none.
+
+    text is the file's segments (PDF pages, DOCX paragraphs, the whole of a TXT file)
+    joined by newlines; segment_ends holds the end offset of each segment in text, so
+    segment i is text[segment_ends[i - 1]:segment_ends[i]] including the newline before
+    it. byte_offsets, when the format has them (TXT), are the source file offsets at
+    which the segments start. backend names the extractor used and elapsed its run time
+    in seconds; cached is True for results read from an ExtractionCache. error is an
+    ExtractionError when extraction failed, in which case text is empty.
+    """
+
+    __slots__ = ("text", "segment_ends", "byte_offsets", "backend", "elapsed", "cached", "error")
+
+    def __init__(self, text="", segment_ends=None, byte_offsets=None, backend=None, elapsed=0.0, cached=False,
+                 error=None):
+        self.text = text
+        self.segment_ends = array("q", [len(text)] if segment_ends is None and text else segment_ends or [])
+        self.byte_offsets = array("q", byte_offsets) if byte_offsets is not None else None
+        self.backend = backend
+        self.elapsed = elapsed
+        self.cached = cached
+        self.error = error
+
+    @classmethod
+    def from_segments(cls, segments, **fields):
+        """Result whose text joins an iterable of segment texts with newlines."""
+        parts = []
+        segment_ends = array("q")
+        position = -1
+        for segment in segments:
+            parts.append(segment)
+            position += len(segment) + 1
+            segment_ends.append(position)
+        return cls("\n".join(parts), segment_ends, **fields)
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def segments(self):
+        """Yield the text of each segment, without the separating newlines."""
+        start = 0
+        for index, end in enumerate(self.segment_ends):
+            yield self.text[start + 1 if index else 0:end]
+            start = end
+
+    def as_text(self):
+        """The text, or an "Error: ..." message for a failed extraction (the format of the string-returning helpers)."""
+        return self.text if self.ok else f"Error: {self.error}"
+
+    def __repr__(self):
+        if not self.ok:
+            return f"<ExtractionResult error={self.error.__class__.__name__}: {self.error}>"
+        return (f"<ExtractionResult {len(self.text)} chars in {len(self.segment_ends)} segments "
+                f"backend={self.backend} elapsed={self.elapsed:.3f}s cached={self.cached}>")
+
+def _lacks_text(text):
+    """True if text has fewer than MIN_TEXT_CHARS non-whitespace characters (without copying long texts)."""
+    if len(text) > 64 * MIN_TEXT_CHARS:
+        return NON_SPACE_RE.search(text) is None
+    return len(text.strip()) < MIN_TEXT_CHARS
+
+def _run_extractor(extractor, file_path, **options):
+    """Run extractor(file_path, **options), timing it and turning failures into an error result."""
+    start = time.perf_counter()
+    try:
+        result = extractor(file_path, **options)
+        if _lacks_text(result.text):
+            raise NoTextError(f"No extractable text in {os.path.basename(file_path)}")
+    except ExtractionError as e:
+        result = ExtractionResult(error=e)
+    except MemoryError:
+        raise
+    except Exception as e:
+        result = ExtractionResult(error=ExtractionError(f"Extracting {os.path.basename(file_path)} failed: {str(e)}"))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+def _iter_pages_pdfplumber(pdf_path, pages=None):
+    """pdfplumber backend: accurate character-level layout, releasing page caches as it goes."""
     import pdfplumber
-    PDFPLUMBER_AVAILABLE = True
-except ImportError:
-    print("WARNING: pdfplumber not available. Install with 'pip install pdfplumber'.")
-    PDFPLUMBER_AVAILABLE = False
 
-try:
-    from docx import Document
-    DOCX_AVAILABLE = True
-except ImportError:
-    print("WARNING: python-docx not available. Install with 'pip install python-docx'.")
-    DOCX_AVAILABLE = False
+    with pdfplumber.open(pdf_path, pages=pages) as pdf:
+        for page in pdf.pages:
+            try:
+                yield page.extract_text() or ""
+            finally:
+                if hasattr(page, "close"):
+                    page.close()
+                else:
+                    page.flush_cache()
+
+def _iter_pages_pdfminer(pdf_path, pages=None):
+    """pdfminer backend: plain text converter with layout analysis disabled."""
+    from pdfminer.converter import TextConverter
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    resource_manager = PDFResourceManager()
+    output = io.StringIO()
+    converter = TextConverter(resource_manager, output, laparams=None)
+    interpreter = PDFPageInterpreter(resource_manager, converter)
+    page_numbers = None if pages is None else {page_number - 1 for page_number in pages}
+    try:
+        with open(pdf_path, "rb") as fp:
+            for page in PDFPage.get_pages(fp, pagenos=page_numbers):
+                interpreter.process_page(page)
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+    finally:
+        converter.close()
+
+def _iter_pages_pypdf(pdf_path, pages=None):
+    """pypdf backend: content-stream text extraction without layout analysis."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(pdf_path)
+    page_numbers = range(1, len(reader.pages) + 1) if pages is None else pages
+    for page_number in page_numbers:
+        yield reader.pages[page_number - 1].extract_text() or ""
+
+PDF_BACKENDS = {}
+PDF_BACKEND_PACKAGES = {}
+DEFAULT_PDF_BACKEND = "pdfplumber"
+FAST_PDF_BACKENDS = ["pypdf", "pdfminer"]
+FAST_PDF_MIN_BYTES = 8 * 1024 * 1024
+
+def register_pdf_backend(name, iter_pages, package):
+    """Register a PDF backend: iter_pages(pdf_path, pages=None) yields page texts."""
+    PDF_BACKENDS[name] = iter_pages
+    PDF_BACKEND_PACKAGES[name] = package
+
+def detect_backends():
+    """Locate the optional extraction libraries and register the PDF backends they provide.
 
-def extract_text_from_pdf(pdf_path):
-    """Extract text from PDF using pdfplumber."""
+    Runs at import; call it again after installing packages in a running process.
+    """
+    global PDFPLUMBER_AVAILABLE, PDFMINER_AVAILABLE, PYPDF_AVAILABLE, DOCX_AVAILABLE
+
+    PDFPLUMBER_AVAILABLE = find_spec("pdfplumber") is not None
     if not PDFPLUMBER_AVAILABLE:
-        return "Error: pdfplumber required. Install with 'pip install pdfplumber'."
+        print("WARNING: pdfplumber not available. Install with 'pip install pdfplumber'.")
+    PDFMINER_AVAILABLE = find_spec("pdfminer") is not None
+    PYPDF_AVAILABLE = find_spec("pypdf") is not None
+    DOCX_AVAILABLE = find_spec("docx") is not None
+    if not DOCX_AVAILABLE:
+        print("WARNING: python-docx not available; DOCX files that the built-in reader cannot parse will fail. "
+              "Install with 'pip install python-docx'.")
+
+    if PDFPLUMBER_AVAILABLE:
+        register_pdf_backend("pdfplumber", _iter_pages_pdfplumber, "pdfplumber")
+    if PDFMINER_AVAILABLE:
+        register_pdf_backend("pdfminer", _iter_pages_pdfminer, "pdfminer.six")
+    if PYPDF_AVAILABLE:
+        register_pdf_backend("pypdf", _iter_pages_pypdf, "pypdf")
+
+detect_backends()
+
+BACKEND_MODULES = {
+    "pdfplumber": ["pdfplumber"],
+    "pdfminer": ["pdfminer.converter", "pdfminer.pdfinterp", "pdfminer.pdfpage"],
+    "pypdf": ["pypdf"],
+}
+
+def preload_backends():
+    """Import every registered extraction backend (and python-docx) now instead of on first use."""
+    import importlib
+
+    modules = [module for name in PDF_BACKENDS for module in BACKEND_MODULES.get(name, [])]
+    if DOCX_AVAILABLE:
+        modules.append("docx")
+    for module in modules:
+        importlib.import_module(module)
+    return modules
+
+def select_pdf_backend(pdf_path, backend=None):
+    """Resolve a backend name; "auto" picks a fast backend for files of FAST_PDF_MIN_BYTES or more."""
+    backend = backend or DEFAULT_PDF_BACKEND
+    if backend != "auto":
+        if backend not in PDF_BACKENDS:
+            raise ImportError(f"PDF backend '{backend}' not available. Install with "
+                              f"'pip install {PDF_BACKEND_PACKAGES.get(backend, backend)}'.")
+        return backend
     
+    if os.path.getsize(pdf_path) >= FAST_PDF_MIN_BYTES:
+        for name in FAST_PDF_BACKENDS:
+            if name in PDF_BACKENDS:
+                return name
+    if DEFAULT_PDF_BACKEND in PDF_BACKENDS:
+        return DEFAULT_PDF_BACKEND
+    if PDF_BACKENDS:
+        return next(iter(PDF_BACKENDS))
+    raise ImportError("pdfplumber required. Install with 'pip install pdfplumber'.")
+
+def iter_pdf_pages(pdf_path, pages=None, backend=None):
+    """Yield the text of each PDF page as it is parsed.
+
+    With the pdfplumber backend each page's layout caches are released once its text has
+    been yielded, so memory is bounded by a single page. pages optionally restricts
+    extraction to 1-based page numbers; backend is a PDF_BACKENDS name or "auto".
+    """
+    return PDF_BACKENDS[select_pdf_backend(pdf_path, backend)](pdf_path, pages)
+
+def count_pdf_pages(pdf_path):
+    """Number of pages in a PDF."""
+    if PDFMINER_AVAILABLE:
+        from pdfminer.pdfpage import PDFPage
+
+        with open(pdf_path, "rb") as fp:
+            return sum(1 for _ in PDFPage.get_pages(fp))
+    if PYPDF_AVAILABLE:
+        from pypdf import PdfReader
+
+        return len(PdfReader(pdf_path).pages)
+    raise ImportError("pdfplumber required. Install with 'pip install pdfplumber'.")
+
+def _extract_pdf_page_range(pdf_path, first_page, last_page, backend=None):
+    """Process pool task: open the PDF independently and extract pages first_page..last_page (1-based)."""
+    return list(iter_pdf_pages(pdf_path, pages=list(range(first_page, last_page + 1)), backend=backend))
+
+def _extract_pdf_pages_serial(pdf_path, backend=None, progress=None):
+    """Extract page texts in order, calling progress(pages_done, pages_total) after each page."""
+    if progress is None:
+        return list(iter_pdf_pages(pdf_path, backend=backend))
+    
+    page_count = count_pdf_pages(pdf_path)
+    page_texts = []
+    for page_text in iter_pdf_pages(pdf_path, backend=backend):
+        page_texts.append(page_text)
+        progress(len(page_texts), page_count)
+    return page_texts
+
+def _process_context():
+    """multiprocessing context for the child processes started here.
+
+    Extraction runs in job-queue threads, and a forked child can inherit a lock (logging,
+    stdio, the database pool) that another thread held at the time and deadlock on it.
+    forkserver children are forked from a separate single-threaded server instead;
+    spawn is used where forkserver is unavailable (Windows).
+    """
+    import multiprocessing
+
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+def extract_pdf_pages_parallel(pdf_path, workers=None, slices_per_worker=2, backend=None, progress=None):
+    """Extract page texts by splitting the page range across a process pool.
+
+    Every worker opens the file itself and extracts a contiguous slice; slices are
+    reassembled in page order. progress(pages_done, pages_total) is called as slices finish.
+    """
+    backend = select_pdf_backend(pdf_path, backend)
+    workers = workers or os.cpu_count() or 1
+    page_count = count_pdf_pages(pdf_path)
+    if workers <= 1 or page_count <= 1:
+        return _extract_pdf_pages_serial(pdf_path, backend, progress)
+    
+    slice_count = min(page_count, workers * slices_per_worker)
+    slice_size = -(-page_count // slice_count)
+    ranges = [(first, min(first + slice_size - 1, page_count)) for first in range(1, page_count + 1, slice_size)]
+    page_texts = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges)), mp_context=_process_context()) as executor:
+        for texts in executor.map(_extract_pdf_page_range, [pdf_path] * len(ranges),
+                                  [first for first, _ in ranges], [last for _, last in ranges],
+                                  [backend] * len(ranges)):
+            page_texts.extend(texts)
+            if progress:
+                progress(len(page_texts), page_count)
+    return page_texts
+
+def _extract_pdf(pdf_path, backend=None, progress=None, workers=None):
+    """PDF extractor: one segment per page."""
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            text = "\n".join(page.extract_text() or "" for page in pdf.pages)
-        return text if text.strip() else "Error: No extractable text in PDF."
-    except Exception as e:
-        return f"Error extracting PDF {pdf_path}: {str(e)}"
+        backend = select_pdf_backend(pdf_path, backend)
+    except ImportError as e:
+        raise BackendUnavailableError(str(e))
+    if workers and workers > 1:
+        pages = extract_pdf_pages_parallel(pdf_path, workers, backend=backend, progress=progress)
+    else:
+        pages = _extract_pdf_pages_serial(pdf_path, backend, progress)
+    return ExtractionResult.from_segments(pages, backend=backend)
 
-def extract_text_from_docx(docx_path):
-    """Extract text from DOCX using python-docx."""
+def extract_text_from_pdf(pdf_path, workers=None, backend=None, progress=None):
+    """Extract text from PDF (pdfplumber by default), optionally across a process pool of workers.
+
+    progress, if given, is called as progress(pages_done, pages_total) while pages are extracted.
+    Returns the text or an "Error: ..." message; extract() gives a structured result.
+    """
+    return _run_extractor(_extract_pdf, pdf_path, backend=backend, progress=progress, workers=workers).as_text()
+
+W_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_P = W_NAMESPACE + "p"
+# Run content that contributes to a paragraph's text (deleted text, w:delText, does not)
+DOCX_RUN_TEXT = {
+    W_NAMESPACE + "t": None,
+    W_NAMESPACE + "tab": "\t",
+    W_NAMESPACE + "br": "\n",
+    W_NAMESPACE + "cr": "\n",
+}
+# Elements whose children are whole blocks (paragraphs, tables, notes) that can be dropped once read
+DOCX_BLOCK_CONTAINERS = {W_NAMESPACE + name for name in ("body", "hdr", "ftr", "footnotes", "endnotes")}
+# Parts read after the main document, as (zip name prefix, suffix) relative to its folder
+DOCX_EXTRA_PARTS = [("header", ".xml"), ("footer", ".xml"), ("footnotes", ".xml"), ("endnotes", ".xml")]
+OFFICE_DOCUMENT_RELATIONSHIP = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+
+def _docx_main_part(archive):
+    """Zip name of the main document part, from the package relationships (usually word/document.xml)."""
+    try:
+        relationships = ET.fromstring(archive.read("_rels/.rels"))
+    except KeyError:
+        return "word/document.xml"
+    for relationship in relationships:
+        if relationship.get("Type") == OFFICE_DOCUMENT_RELATIONSHIP:
+            return relationship.get("Target", "word/document.xml").lstrip("/")
+    return "word/document.xml"
+
+def _iter_docx_part(stream):
+    """Yield the text of each paragraph (including table cells) of one WordprocessingML part.
+
+    Elements are cleared as soon as they are read and detached from the body, so memory
+    use stays flat however long the document is.
+    """
+    stack = []
+    for event, element in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            stack.append(element)
+            continue
+        stack.pop()
+        if element.tag == W_P:
+            text = "".join(DOCX_RUN_TEXT[node.tag] or node.text or ""
+                           for node in element.iter() if node.tag in DOCX_RUN_TEXT)
+            if text.strip():
+                yield text
+            element.clear()
+        if stack and stack[-1].tag in DOCX_BLOCK_CONTAINERS:
+            stack[-1].remove(element)
+
+def iter_docx_paragraphs(docx_path):
+    """Yield paragraph texts of a DOCX file straight from its zip: body and tables, then headers, footers and notes."""
+    with zipfile.ZipFile(docx_path) as archive:
+        main_part = _docx_main_part(archive)
+        folder = posixpath.dirname(main_part)
+        extra_parts = sorted(name for name in archive.namelist()
+                             for prefix, suffix in DOCX_EXTRA_PARTS
+                             if posixpath.dirname(name) == folder
+                             and posixpath.basename(name).startswith(prefix) and name.endswith(suffix))
+        for part in [main_part] + extra_parts:
+            with archive.open(part) as stream:
+                yield from _iter_docx_part(stream)
+
+def _iter_docx_paragraphs_python_docx(docx_path):
+    """Yield the non-empty body paragraphs of a DOCX file using python-docx."""
     if not DOCX_AVAILABLE:
-        return "Error: python-docx required. Install with 'pip install python-docx'."
-    
+        raise BackendUnavailableError("python-docx required. Install with 'pip install python-docx'.")
+    from docx import Document
+
+    for para in Document(docx_path).paragraphs:
+        if para.text.strip():
+            yield para.text
+
+def _extract_docx(docx_path, backend=None, progress=None):
+    """DOCX extractor: one segment per paragraph, streamed from the XML, else read with python-docx."""
     try:
-        doc = Document(docx_path)
-        text = "\n".join(para.text for para in doc.paragraphs if para.text.strip())
-        return text if text.strip() else "Error: No extractable text in DOCX."
-    except Exception as e:
-        return f"Error extracting DOCX {docx_path}: {str(e)}"
+        return ExtractionResult.from_segments(iter_docx_paragraphs(docx_path), backend="docx-stream")
+    except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+        print(f"Warning: streaming DOCX extraction failed for {docx_path} ({str(e)}), using python-docx")
+    return ExtractionResult.from_segments(_iter_docx_paragraphs_python_docx(docx_path), backend="python-docx")
+
+def extract_text_from_docx(docx_path):
+    """Extract text from DOCX by streaming its XML, falling back to python-docx if the package cannot be parsed.
+
+    Returns the text or an "Error: ..." message; extract() gives a structured result.
+    """
+    return _run_extractor(_extract_docx, docx_path).as_text()
+
+TXT_SAMPLE_BYTES = 64 * 1024
+TXT_CHUNK_SIZE = 1024 * 1024
+
+# Checked in order: the UTF-32 LE BOM starts with the UTF-16 LE one
+TEXT_BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+def detect_encoding(sample):
+    """Codec for text starting with the bytes sample.
+
+    A byte order mark decides first; without one, mostly-ASCII UTF-16 is recognized by
+    its NUL bytes at odd (little-endian) or even (big-endian) positions, then the
+    sample is checked as UTF-8, then as Windows-1252. Anything else is read as latin-1,
+    which accepts any byte.
+    """
+    for bom, encoding in TEXT_BOMS:
+        if sample.startswith(bom):
+            return encoding
+    half = len(sample) // 2
+    if half:
+        even_nuls = sample[0:half * 2:2].count(0)
+        odd_nuls = sample[1:half * 2:2].count(0)
+        if odd_nuls > half * 0.3 and even_nuls < half * 0.05:
+            return "utf-16-le"
+        if even_nuls > half * 0.3 and odd_nuls < half * 0.05:
+            return "utf-16-be"
+    try:
+        # final=False: a multi-byte character cut off at the end of the sample is not an error
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    try:
+        sample.decode("cp1252")
+        return "cp1252"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+def _extract_txt(txt_path, backend=None, progress=None):
+    """TXT extractor: the whole file as one segment, read once with the encoding detected from its first bytes."""
+    with open(txt_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return ExtractionResult(backend="txt")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            encoding = detect_encoding(data[:TXT_SAMPLE_BYTES])
+            try:
+                text = codecs.decode(data, encoding)
+            except UnicodeDecodeError:
+                # The sample decoded but later bytes do not; the bytes are still mapped, so no re-read
+                encoding = "latin-1"
+                text = codecs.decode(data, encoding)
+    stripped = text.strip()
+    leading = text[:len(text) - len(text.lstrip())]
+    # Encoding the stripped prefix reproduces its bytes, including the BOM for utf-8-sig/16/32
+    return ExtractionResult(stripped, byte_offsets=[len(leading.encode(encoding))], backend=f"txt-{encoding}")
 
 def extract_text_from_txt(txt_path):
-    """Extract text from TXT with robust encoding handling."""
-    encodings = ['utf-8', 'latin-1', 'utf-16']
-    for encoding in encodings:
+    """Extract text from TXT, reading the file once with the encoding detected from its first bytes.
+
+    Returns the text or an "Error: ..." message; extract() gives a structured result.
+    """
+    return _run_extractor(_extract_txt, txt_path).as_text()
+
+def iter_txt_chunks(txt_path, chunk_size=TXT_CHUNK_SIZE, encoding=None, errors="replace"):
+    """Yield the text of a TXT file in pieces of about chunk_size bytes, each ending at whitespace.
+
+    The file is memory-mapped and read sequentially; pages already decoded are released
+    again, so memory use does not depend on the file size, and calling this a second time
+    re-reads the file from the page cache. The encoding is detected from the first bytes
+    unless given; undecodable bytes are handled per errors (default: replaced). Pieces
+    only break between words, so consumers may join them with a space.
+    """
+    with open(txt_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                data.madvise(mmap.MADV_SEQUENTIAL)
+            decoder = codecs.getincrementaldecoder(encoding or detect_encoding(data[:TXT_SAMPLE_BYTES]))(errors=errors)
+            pending = ""
+            for offset in range(0, len(data), chunk_size):
+                text = pending + decoder.decode(data[offset:offset + chunk_size])
+                if hasattr(mmap, "MADV_DONTNEED") and offset % mmap.PAGESIZE == 0:
+                    data.madvise(mmap.MADV_DONTNEED, offset, min(chunk_size, len(data) - offset))
+                cut = max(text.rfind(" "), text.rfind("\n"), text.rfind("\t"), text.rfind("\r"))
+                if cut < 0 and len(text) < 4 * chunk_size:
+                    pending = text
+                    continue
+                pending = text[cut + 1:] if cut >= 0 else ""
+                if cut != 0:
+                    yield text[:cut + 1] if cut >= 0 else text
+            text = pending + decoder.decode(b"", final=True)
+            if text:
+                yield text
+
+# File extension -> extractor(file_path, backend=None, progress=None) returning an ExtractionResult;
+# extractors raise ExtractionError (or any exception) on failure
+EXTRACTORS = {}
+
+def register_extractor(extension, extractor):
+    """Make extract() (and batch extraction) handle files with the given extension."""
+    EXTRACTORS[extension.lower()] = extractor
+
+register_extractor(".pdf", _extract_pdf)
+register_extractor(".docx", _extract_docx)
+register_extractor(".txt", _extract_txt)
+
+def extract(file_path, backend=None, progress=None):
+    """Extract a file with the extractor registered for its extension, returning an ExtractionResult.
+
+    Never raises for a bad document: failures are reported in the result's error.
+    progress(pages_done, pages_total) is reported per page for PDFs.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    extractor = EXTRACTORS.get(extension)
+    if extractor is None:
+        return ExtractionResult(error=UnsupportedFileError(f"Unsupported file type {extension or file_path}."))
+    return _run_extractor(extractor, file_path, backend=backend, progress=progress)
+
+def extract_text(file_path, backend=None, progress=None):
+    """Extract text from a PDF, DOCX or TXT file; returns the text or an "Error: ..." message (see extract())."""
+    return extract(file_path, backend=backend, progress=progress).as_text()
+
+HASH_CHUNK_SIZE = 1024 * 1024
+EXTRACTION_FORMAT_VERSION = 2
+
+def hash_file(file_path, chunk_size=HASH_CHUNK_SIZE):
+    """Streaming SHA-256 hex digest of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def save_stream(stream, dest_path, chunk_size=HASH_CHUNK_SIZE):
+    """Copy a binary stream to dest_path in chunks, returning the SHA-256 hex digest of the bytes."""
+    digest = hashlib.sha256()
+    with open(dest_path, "wb") as file:
+        for chunk in iter(lambda: stream.read(chunk_size), b""):
+            digest.update(chunk)
+            file.write(chunk)
+    return digest.hexdigest()
+
+ZIP_SIGNATURE = b"PK\x03\x04"
+
+# Leading bytes of each supported binary format (a .docx file is a ZIP archive)
+FILE_SIGNATURES = [
+    (ZIP_SIGNATURE, ".docx"),
+]
+# A PDF header may follow other bytes, as long as it starts within the first 1024
+PDF_SIGNATURE = b"%PDF-"
+PDF_HEADER_WINDOW = 1024
+SNIFF_BYTES = PDF_HEADER_WINDOW
+
+def sniff_file_type(header):
+    """Extension (".pdf", ".docx", ".txt") matching a file's leading bytes, or None if unrecognized."""
+    if header.find(PDF_SIGNATURE, 0, PDF_HEADER_WINDOW) != -1:
+        return ".pdf"
+    for signature, extension in FILE_SIGNATURES:
+        if header.startswith(signature):
+            return extension
+    if b"\x00" not in header or detect_encoding(header).startswith(("utf-16", "utf-32")):
+        return ".txt"
+    return None
+
+class HashingFile:
+    """Temporary file in a directory that hashes and sniffs everything written to it.
+
+    Used as the target of streamed uploads: the bytes go to disk in the chunks they
+    arrive in, so the content hash and file type are known as soon as the upload ends,
+    without reading the file again. keep() moves the file into place; a file that is
+    closed without being kept is deleted.
+    """
+
+    def __init__(self, directory):
+        fd, self.path = tempfile.mkstemp(dir=directory, prefix=".upload-")
+        self.file = os.fdopen(fd, "w+b")
+        self.digest = hashlib.sha256()
+        self.header = b""
+        self.size = 0
+        self.kept = False
+
+    def write(self, data):
+        self.digest.update(data)
+        if len(self.header) < SNIFF_BYTES:
+            self.header += bytes(data[:SNIFF_BYTES - len(self.header)])
+        self.size += len(data)
+        return self.file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+    def hexdigest(self):
+        return self.digest.hexdigest()
+
+    def file_type(self):
+        return sniff_file_type(self.header)
+
+    def keep(self, dest_path):
+        """Close the file and move it to dest_path."""
+        self.file.close()
+        os.replace(self.path, dest_path)
+        self.path = dest_path
+        self.kept = True
+
+    def close(self):
+        self.file.close()
+        if not self.kept and os.path.exists(self.path):
+            os.remove(self.path)
+
+def extraction_version(file_path, backend=None):
+    """Identifier of the extractor that would process file_path, used in extraction cache keys."""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".pdf":
+        name = select_pdf_backend(file_path, backend)
+        package = PDF_BACKEND_PACKAGES[name]
+    elif extension == ".docx":
+        name, package = "docx-stream", None
+    else:
+        name, package = extension.lstrip(".") or "unknown", None
+    try:
+        package_version = metadata.version(package) if package else "builtin"
+    except metadata.PackageNotFoundError:
+        package_version = "unknown"
+    return re.sub(r"[^\w.-]+", "_", f"{name}-{package_version}-v{EXTRACTION_FORMAT_VERSION}")
+
+class ExtractionCache:
+    """On-disk cache of extraction results keyed by content hash and extractor version.
+
+    Entries hold a JSON header (segment ends, byte offsets, backend) and the text, stored
+    zlib-compressed; when the cache grows past max_bytes the least
+    recently used entries (by modification time, refreshed on every hit) are evicted.
+    """
+
+    def __init__(self, cache_dir, max_bytes=256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, digest, version):
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}-{version}.txt.z")
+
+    def get(self, digest, version):
+        """Cached ExtractionResult for a content hash and extractor version, or None."""
+        path = self._entry_path(digest, version)
         try:
-            with open(txt_path, "r", encoding=encoding) as file:
-                return file.read().strip()
-        except Exception:
-            continue
-    return f"Error extracting TXT {txt_path}: All encoding attempts failed."
+            with open(path, "rb") as file:
+                header, text = zlib.decompress(file.read()).decode("utf-8").split("\n", 1)
+            header = json.loads(header)
+            os.utime(path)
+            return ExtractionResult(text, header["segment_ends"], header["byte_offsets"], header["backend"],
+                                    cached=True)
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error, UnicodeDecodeError, ValueError, KeyError) as e:
+            print(f"WARNING: Discarding unreadable extraction cache entry {path}: {str(e)}")
+            self._remove(path)
+            return None
 
-def batch_extract_text(folder_path):
-    """Extract text from all files in a folder."""
-    extracted_texts = {}
-    if not os.path.exists(folder_path):
-        return {"error": f"Folder not found: {folder_path}"}
-    
-    for file_name in os.listdir(folder_path):
-        file_path = os.path.join(folder_path, file_name)
-        if not os.path.isfile(file_path):
-            continue
-        
+    def put(self, digest, version, result):
+        """Store a successful ExtractionResult atomically, then evict old entries if the cache is over its size limit."""
+        path = self._entry_path(digest, version)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                header = json.dumps({
+                    "segment_ends": result.segment_ends.tolist(),
+                    "byte_offsets": result.byte_offsets.tolist() if result.byte_offsets is not None else None,
+                    "backend": result.backend,
+                })
+                file.write(zlib.compress(f"{header}\n{result.text}".encode("utf-8")))
+            os.replace(tmp_path, path)
+        except OSError:
+            self._remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for root, _, file_names in os.walk(self.cache_dir):
+            for file_name in file_names:
+                if not file_name.endswith(".txt.z"):
+                    continue
+                path = os.path.join(root, file_name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
         try:
-            if file_name.lower().endswith(".pdf"):
-                extracted_texts[file_name] = extract_text_from_pdf(file_path)
-            elif file_name.lower().endswith(".docx"):
-                extracted_texts[file_name] = extract_text_from_docx(file_path)
-            elif file_name.lower().endswith(".txt"):
-                extracted_texts[file_name] = extract_text_from_txt(file_path)
-        except Exception as e:
-            extracted_texts[file_name] = f"Error processing {file_name}: {str(e)}"
-            print(f"Error: {traceback.format_exc()}")
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def extract_cached(file_path, cache, backend=None, digest=None, progress=None):
+    """extract() that consults an ExtractionCache first; failed extractions are not cached.
+
+    digest may be passed when the content hash is already known.
+    """
+    try:
+        version = extraction_version(file_path, backend)
+    except ImportError as e:
+        return ExtractionResult(error=BackendUnavailableError(str(e)))
+    except Exception as e:
+        return ExtractionResult(error=ExtractionError(f"Extracting {os.path.basename(file_path)} failed: {str(e)}"))
+    digest = digest or hash_file(file_path)
+    start = time.perf_counter()
+    result = cache.get(digest, version)
+    if result is not None:
+        result.elapsed = time.perf_counter() - start
+        return result
     
-    return extracted_texts
\ No newline at end of file
+    result = extract(file_path, backend=backend, progress=progress)
+    if result.ok:
+        cache.put(digest, version, result)
+    return result
+
+BATCH_FILE_TIMEOUT = 300
+
+def _apply_memory_limit(memory_limit):
+    """Cap this process's address space at memory_limit bytes; False (with a warning) if that is not possible."""
+    try:
+        import resource
+
+        soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY and hard < memory_limit:
+            print(f"WARNING: address space hard limit ({hard // (1024 * 1024)}MB) is below the batch memory limit; "
+                  f"extracting without it.")
+            return False
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, hard))
+        return True
+    except (ImportError, AttributeError, ValueError, OSError) as e:
+        # No resource module (Windows) or no RLIMIT_AS on this platform
+        print(f"WARNING: Cannot limit extraction memory on this system ({str(e)}); extracting without a limit.")
+        return False
+
+def _extract_in_child(file_path, backend, memory_limit, connection):
+    """Extraction process body: apply the memory limit, extract, and send the ExtractionResult back."""
+    file_name = os.path.basename(file_path)
+    try:
+        if memory_limit and not _apply_memory_limit(memory_limit):
+            memory_limit = None
+        result = extract(file_path, backend=backend)
+    except MemoryError:
+        if memory_limit:
+            message = f"{file_name} exceeded the memory limit of {memory_limit // (1024 * 1024)}MB"
+        else:
+            message = f"{file_name} ran out of memory"
+        result = ExtractionResult(error=ExtractionLimitError(message))
+    except Exception as e:
+        result = ExtractionResult(error=ExtractionError(f"Extracting {file_name} failed: {str(e)}"))
+    connection.send(result)
+    connection.close()
+
+def iter_batch_extract_text(folder_path, workers=None, timeout=BATCH_FILE_TIMEOUT, memory_limit=None, backend=None):
+    """Extract every supported file in a folder in parallel, yielding (file_name, ExtractionResult) as files finish.
+
+    Each file is extracted in its own process, at most workers (default: CPU count) at
+    a time. A file that takes longer than timeout seconds is killed, and memory_limit
+    (bytes of address space) caps each process, so one pathological document yields an
+    ExtractionLimitError result instead of hanging or exhausting the batch. Raises
+    FileNotFoundError if folder_path does not exist.
+    """
+    from multiprocessing.connection import wait
+
+    if not os.path.isdir(folder_path):
+        raise FileNotFoundError(f"Folder not found: {folder_path}")
+    with os.scandir(folder_path) as entries:
+        pending = deque(entry.path for entry in entries
+                        if entry.is_file() and os.path.splitext(entry.name)[1].lower() in EXTRACTORS)
+    workers = workers or os.cpu_count() or 1
+    context = _process_context()
+    running = {}  # reader connection -> (file name, process, started, deadline)
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                file_path = pending.popleft()
+                reader, writer = context.Pipe(duplex=False)
+                process = context.Process(target=_extract_in_child, args=(file_path, backend, memory_limit, writer))
+                process.start()
+                writer.close()
+                started = time.monotonic()
+                running[reader] = (os.path.basename(file_path), process, started, started + timeout)
+
+            next_deadline = min(deadline for _, _, _, deadline in running.values())
+            for reader in wait(list(running), timeout=max(0.0, next_deadline - time.monotonic())):
+                file_name, process, started, _ = running.pop(reader)
+                try:
+                    result = reader.recv()
+                except EOFError:
+                    process.join()
+                    result = ExtractionResult(error=ExtractionError(
+                        f"Extraction process for {file_name} exited with code {process.exitcode}"))
+                    result.elapsed = time.monotonic() - started
+                reader.close()
+                process.join()
+                yield file_name, result
+
+            now = time.monotonic()
+            for reader, (file_name, process, started, deadline) in list(running.items()):
+                if now >= deadline:
+                    del running[reader]
+                    process.kill()
+                    process.join()
+                    reader.close()
+                    result = ExtractionResult(error=ExtractionLimitError(f"{file_name} timed out after {timeout}s"))
+                    result.elapsed = now - started
+                    yield file_name, result
+    finally:
+        for reader, (_, process, _, _) in running.items():
+            process.kill()
+            process.join()
+            reader.close()
+
+def batch_extract_text(folder_path, workers=None, timeout=BATCH_FILE_TIMEOUT, memory_limit=None, backend=None):
+    """Extract text from all files in a folder (see iter_batch_extract_text); failures map to "Error: ..." messages."""
+    try:
+        return {file_name: result.as_text()
+                for file_name, result in iter_batch_extract_text(folder_path, workers, timeout, memory_limit, backend)}
+    except FileNotFoundError as e:
+        return {"error": f"Error: {str(e)}"}
+
+def unique_path(folder_path, file_name):
+    """Path for file_name in folder_path, numbered (name-1.ext, name-2.ext, ...) if it is taken."""
+    stem, extension = os.path.splitext(file_name)
+    path = os.path.join(folder_path, file_name)
+    counter = 1
+    while os.path.exists(path):
+        path = os.path.join(folder_path, f"{stem}-{counter}{extension}")
+        counter += 1
+    return path
+
+def extract_zip(zip_path, folder_path, extensions, max_files, max_bytes, chunk_size=HASH_CHUNK_SIZE):
+    """Unpack the supported documents of a ZIP archive into folder_path.
+
+    Directory structure is flattened and names are made safe and unique. Returns
+    (files, skipped): (file name, SHA-256 hex digest) of each unpacked document and
+    (member name, reason) of each member left out. Raises ValueError if the archive is
+    not a valid ZIP file, holds more than max_files documents or would unpack to more than
+    max_bytes; files already unpacked from the archive are removed first.
+    """
+    from werkzeug.utils import secure_filename
+
+    try:
+        archive = zipfile.ZipFile(zip_path)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Not a valid ZIP archive: {str(e)}")
+    files, skipped = [], []
+    with archive:
+        members = [info for info in archive.infolist() if not info.is_dir()]
+        documents = [info for info in members if os.path.splitext(info.filename)[1].lower() in extensions]
+        skipped.extend((info.filename, "Unsupported file type") for info in members if info not in documents)
+        if len(documents) > max_files:
+            raise ValueError(f"Archive holds {len(documents)} documents (max {max_files})")
+        if sum(info.file_size for info in documents) > max_bytes:
+            raise ValueError(f"Archive unpacks to more than the {max_bytes / (1024 * 1024):.1f}MB left for the batch")
+
+        remaining = max_bytes
+        written = []
+        try:
+            for info in documents:
+                file_name = secure_filename(os.path.basename(info.filename))
+                if not file_name:
+                    skipped.append((info.filename, "Invalid file name"))
+                    continue
+                dest_path = unique_path(folder_path, file_name)
+                written.append(dest_path)
+                # file_size comes from the archive itself, so the bytes actually unpacked are counted too
+                with archive.open(info) as member:
+                    digest = save_stream(_LimitedReader(member, remaining), dest_path, chunk_size)
+                remaining -= os.path.getsize(dest_path)
+                files.append((os.path.basename(dest_path), digest))
+        except (zipfile.BadZipFile, zlib.error, EOFError) as e:
+            _remove_files(written)
+            raise ValueError(f"Corrupt ZIP archive: {str(e)}")
+        except BaseException:
+            _remove_files(written)
+            raise
+    return files, skipped
+
+def _remove_files(paths):
+    """Delete the files that exist among paths."""
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+class _LimitedReader:
+    """Binary reader that raises ValueError once more than limit bytes have been read."""
+
+    def __init__(self, stream, limit):
+        self.stream = stream
+        self.remaining = limit
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.remaining -= len(data)
+        if self.remaining < 0:
+            raise ValueError("Archive unpacks to more data than it declares")
+        return data
@@ -0,0 +1,35 @@
+"""
+Gunicorn configuration for the Document Summarizer application.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The app is imported and warmed up once in the master process (preload_app + when_ready),
+so every worker inherits the loaded NLTK models and extraction backends copy-on-write.
+Set SECRET_KEY in the environment (or let the app create instance/secret_key) so that
+all workers sign sessions with the same key.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+preload_app = True
+
+def when_ready(server):
+    """Runs in the master after the app is loaded and before any worker is forked."""
+    import startup
+
+    startup.warmup()
+
+def post_fork(server, worker):
+    """Give each worker its own database connections and resume jobs left queued."""
+    from web_app import db
+
+    app = server.app.wsgi()
+    with app.app_context():
+        db.engine.dispose(close=False)
+    app.extensions["job_queue"].resume_pending()
+    app.extensions["batch_queue"].resume_pending()
@@ -0,0 +1,148 @@
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+class JobQueue:
+    """In-process worker pool for jobs persisted in a database table.
+
+    Jobs are rows of model (see web_app.Job). handler(job, queue) runs in a worker thread
+    inside an application context and reports progress through queue.update(); it must
+    finish by setting the job's status to JOB_DONE or JOB_FAILED. An exception raised by
+    the handler marks the job as failed. While a job runs, a heartbeat thread refreshes
+    its updated_at every stale_after / 3 seconds; a running job not updated for
+    stale_after seconds is assumed to belong to a process that died and is marked as
+    failed. Finished jobs are never changed by update(), so a late worker cannot undo that.
+    """
+
+    STALE_MESSAGE = "Processing was interrupted (the server restarted or a worker crashed). Please try again."
+
+    def __init__(self, app, db, model, handler, workers=2, stale_after=15 * 60):
+        self.app = app
+        self.db = db
+        self.model = model
+        self.handler = handler
+        self.stale_after = stale_after
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job-worker")
+        self._running = set()
+        self._lock = threading.Lock()
+        self._heartbeat = None
+
+    @staticmethod
+    def new_job_id():
+        return uuid.uuid4().hex
+
+    def create(self, **fields):
+        """Persist a queued job and return it (fields may include the id from new_job_id())."""
+        now = time.time()
+        fields.setdefault("id", self.new_job_id())
+        job = self.model(status=JOB_QUEUED, created_at=now, updated_at=now, **fields)
+        self.db.session.add(job)
+        self.db.session.commit()
+        return job
+
+    def submit(self, job_id):
+        """Schedule a queued job on the worker pool."""
+        return self.executor.submit(self._run, job_id)
+
+    def update(self, job, **fields):
+        """Set job fields and commit, so status polls see them immediately.
+
+        Returns False, changing nothing, if the job has already finished (e.g. it was
+        expired as stale while this worker was still busy with it).
+        """
+        fields["updated_at"] = time.time()
+        updated = self.model.query.filter(self.model.id == job.id,
+                                          self.model.status.in_([JOB_QUEUED, JOB_RUNNING])).update(
+            fields, synchronize_session=False)
+        self.db.session.commit()
+        return updated == 1
+
+    def expire_stale(self, job=None):
+        """Fail running jobs (or just job) whose process stopped updating them; returns how many.
+
+        They are failed rather than requeued, since a job that crashed its worker would
+        likely crash the next one too.
+        """
+        query = self.model.query.filter(self.model.status == JOB_RUNNING,
+                                        self.model.updated_at < time.time() - self.stale_after)
+        if job is not None:
+            query = query.filter(self.model.id == job.id)
+        expired = query.update({"status": JOB_FAILED, "message": self.STALE_MESSAGE, "updated_at": time.time()},
+                               synchronize_session=False)
+        self.db.session.commit()
+        if job is not None and expired:
+            self.db.session.refresh(job)
+        return expired
+
+    def resume_pending(self):
+        """Fail stale running jobs and resubmit jobs still queued in the database, e.g. after a restart."""
+        with self.app.app_context():
+            self.expire_stale()
+            job_ids = [job_id for job_id, in self.db.session.query(self.model.id)
+                       .filter_by(status=JOB_QUEUED).order_by(self.model.created_at)]
+        for job_id in job_ids:
+            self.submit(job_id)
+        return len(job_ids)
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+
+    def _claim(self, job_id):
+        """Atomically move a job from queued to running; False if another worker got it first."""
+        claimed = self.model.query.filter_by(id=job_id, status=JOB_QUEUED).update(
+            {"status": JOB_RUNNING, "updated_at": time.time()}, synchronize_session=False)
+        self.db.session.commit()
+        return claimed == 1
+
+    def _beat(self):
+        """Heartbeat thread body: keep updated_at of this process's running jobs fresh."""
+        while True:
+            time.sleep(self.stale_after / 3)
+            with self._lock:
+                job_ids = list(self._running)
+            if not job_ids:
+                continue
+            with self.app.app_context():
+                try:
+                    self.model.query.filter(self.model.id.in_(job_ids), self.model.status == JOB_RUNNING).update(
+                        {"updated_at": time.time()}, synchronize_session=False)
+                    self.db.session.commit()
+                except Exception as e:
+                    print(f"Job heartbeat failed: {str(e)}")
+                finally:
+                    self.db.session.remove()
+
+    def _track(self, job_id):
+        """Include a claimed job in the heartbeat, starting the thread in this process if needed."""
+        with self._lock:
+            self._running.add(job_id)
+            # Threads do not survive a fork, so each server worker starts its own
+            if self._heartbeat is None or not self._heartbeat.is_alive():
+                self._heartbeat = threading.Thread(target=self._beat, name="job-heartbeat", daemon=True)
+                self._heartbeat.start()
+
+    def _run(self, job_id):
+        with self.app.app_context():
+            try:
+                if not self._claim(job_id):
+                    return
+                self._track(job_id)
+                job = self.db.session.get(self.model, job_id)
+                try:
+                    self.handler(job, self)
+                except Exception as e:
+                    print(f"Error processing job {job_id}: {str(e)}\n{traceback.format_exc()}")
+                    self.db.session.rollback()
+                    job = self.db.session.get(self.model, job_id)
+                    self.update(job, status=JOB_FAILED, message=f"Error processing file: {str(e)}")
+            finally:
+                with self._lock:
+                    self._running.discard(job_id)
+                self.db.session.remove()
@@ -0,0 +1,72 @@
+"""
+Lightweight schema migrations for the application database.
+
+run_migrations() is called by web_app.initialize_database() after db.create_all(), which
+creates missing tables but never alters existing ones. Each migration checks the live
+schema before changing it, so it is safe on new databases, on old ones and when several
+workers start at once. Applied versions are recorded in the schema_migrations table.
+"""
+
+import time
+
+from sqlalchemy import Float, String, Text, inspect, text
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
+
+def _add_column(connection, table, name, column_type):
+    """ALTER TABLE ... ADD COLUMN unless the column already exists (nullable, no data rewrite)."""
+    if name in {column["name"] for column in inspect(connection).get_columns(table)}:
+        return
+    quote = connection.dialect.identifier_preparer.quote
+    ddl_type = column_type.compile(dialect=connection.dialect)
+    connection.execute(text(f"ALTER TABLE {quote(table)} ADD COLUMN {quote(name)} {ddl_type}"))
+
+def _create_index(connection, name, table, columns):
+    quote = connection.dialect.identifier_preparer.quote
+    connection.execute(text(f"CREATE INDEX IF NOT EXISTS {quote(name)} ON {quote(table)} "
+                            f"({', '.join(quote(column) for column in columns)})"))
+
+def _index_summary_user(connection):
+    _create_index(connection, "ix_summary_user_id", "summary", ["user_id"])
+
+def _summary_metadata_columns(connection):
+    _add_column(connection, "summary", "created_at", Float())
+    _add_column(connection, "summary", "content_hash", String(64))
+    _add_column(connection, "summary", "parameters", Text())
+    _create_index(connection, "ix_summary_content_hash", "summary", ["content_hash"])
+
+def _user_created_at(connection):
+    _add_column(connection, "user", "created_at", Float())
+
+MIGRATIONS = [
+    (1, "index summary.user_id", _index_summary_user),
+    (2, "summary created_at, content_hash and parameters", _summary_metadata_columns),
+    (3, "user created_at", _user_created_at),
+]
+
+def run_migrations(engine):
+    """Apply pending migrations in version order; returns the versions applied."""
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations "
+            "(version INTEGER PRIMARY KEY, name VARCHAR(255) NOT NULL, applied_at FLOAT NOT NULL)"))
+        applied = {version for version, in connection.execute(text("SELECT version FROM schema_migrations"))}
+
+    newly_applied = []
+    for version, name, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+        try:
+            with engine.begin() as connection:
+                migrate(connection)
+                connection.execute(text(
+                    "INSERT INTO schema_migrations (version, name, applied_at) VALUES (:version, :name, :applied_at)"),
+                    {"version": version, "name": name, "applied_at": time.time()})
+        except (IntegrityError, OperationalError, ProgrammingError) as e:
+            # Another worker applied it concurrently; re-running the idempotent step confirms the schema.
+            print(f"Migration {version} ({name}) raced with another process: {str(e).splitlines()[0]}")
+            with engine.begin() as connection:
+                migrate(connection)
+            continue
+        print(f"Applied migration {version}: {name}")
+        newly_applied.append(version)
+    return newly_applied
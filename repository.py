@@ -0,0 +1,73 @@
+from sqlalchemy import func, insert, select
+
+class SummaryRepository:
+    """Data access for Summary rows, independent of the database backend (SQLite or Postgres).
+
+    session is a SQLAlchemy session (e.g. Flask-SQLAlchemy's db.session) and model the
+    mapped Summary class.
+    """
+
+    def __init__(self, session, model):
+        self.session = session
+        self.model = model
+
+    def add(self, **fields):
+        """Insert one summary and flush it so its id is available; the caller commits."""
+        summary = self.model(**fields)
+        self.session.add(summary)
+        self.session.flush()
+        return summary
+
+    def bulk_insert(self, rows, batch_size=5000):
+        """Insert many summaries (dicts of column values) in a single transaction.
+
+        Rows are sent as executemany batches of batch_size without building ORM objects.
+        Returns the number of rows inserted; nothing is inserted if any batch fails.
+        """
+        count = 0
+        batch = []
+        try:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    self.session.execute(insert(self.model), batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                self.session.execute(insert(self.model), batch)
+                count += len(batch)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return count
+
+    def get_for_user(self, summary_id, user_id):
+        """A summary owned by user_id, or None."""
+        return self.session.execute(
+            select(self.model).filter_by(id=summary_id, user_id=user_id)).scalar_one_or_none()
+
+    def find_by_content(self, user_id, content_hash, parameters):
+        """The user's latest summary of the same content with the same parameters, or None."""
+        return self.session.execute(
+            select(self.model).filter_by(user_id=user_id, content_hash=content_hash, parameters=parameters)
+            .order_by(self.model.id.desc()).limit(1)).scalar_one_or_none()
+
+    def history_page(self, user_id, before_id=None, limit=20, preview_chars=200):
+        """One keyset page of a user's summaries, newest first, loading only ids, names and previews.
+
+        Returns (rows, next_before) where next_before is the id to pass as before_id for the
+        following page, or None on the last page.
+        """
+        model = self.model
+        query = select(
+            model.id,
+            model.file_name,
+            func.substr(model.summary_text, 1, preview_chars).label("preview"),
+            (func.length(model.summary_text) > preview_chars).label("truncated"),
+        ).where(model.user_id == user_id)
+        if before_id is not None:
+            query = query.where(model.id < before_id)
+        rows = self.session.execute(query.order_by(model.id.desc()).limit(limit + 1)).all()
+        next_before = rows[limit - 1].id if len(rows) > limit else None
+        return rows[:limit], next_before
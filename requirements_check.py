@@ -179,7 +179,7 @@ def print_installation_instructions():
     print("pip install sumy nltk transformers torch")
     
     print("\n# Initialize NLTK data (required for sumy)")
-    print("python -c \"import nltk; nltk.download('punkt')\"")
+    print("python -c \"import nltk; nltk.download('punkt_tab')\"")
     
     print("\n# All dependencies in one command")
     print("pip install flask flask-sqlalchemy pymupdf docx2txt sumy nltk transformers torch")
@@ -0,0 +1,150 @@
+"""
+Startup readiness checks for the Document Summarizer application.
+
+check_readiness() verifies the Python packages and NLTK resources the app needs and
+records the verified resources in a marker file. While the marker is valid (same Python,
+same package versions, resource paths still present), later checks only read it, so
+starting a worker neither imports the heavy libraries nor touches the network.
+warmup() loads those libraries deliberately, once, before worker processes are forked.
+"""
+
+import gc
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+from importlib import metadata
+from importlib.util import find_spec
+
+# pip package name -> importable module name
+REQUIRED_PACKAGES = {
+    "nltk": "nltk",
+    "pdfplumber": "pdfplumber",
+    "python-docx": "docx",
+}
+
+# A failed check is re-run after this many seconds, so /healthz recovers once data is installed
+RECHECK_SECONDS = 60
+
+_cached_reports = {}
+
+def install_required_packages():
+    """Install required packages, then let file_handler register the backends they provide."""
+    installed = False
+    for package, module in REQUIRED_PACKAGES.items():
+        if find_spec(module) is None:
+            print(f"Installing {package}...")
+            subprocess.check_call([sys.executable, "-m", "pip", "install", package])
+            print(f"{package} installed.")
+            installed = True
+    if installed:
+        importlib.invalidate_caches()
+        import file_handler
+
+        file_handler.detect_backends()
+
+def _package_versions():
+    versions = {}
+    for package in REQUIRED_PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+def _verify(download):
+    """Check packages and NLTK resources, importing NLTK (and downloading data if allowed)."""
+    import summarizer
+
+    report = {
+        "python": sys.executable,
+        "packages": _package_versions(),
+        "nltk_resources": {},
+        "errors": [],
+        "checked_at": time.time(),
+    }
+    for package, version in report["packages"].items():
+        if version is None:
+            report["errors"].append(f"Missing package '{package}'. Install with 'pip install {package}'.")
+    if report["packages"]["nltk"] is not None:
+        try:
+            report["nltk_resources"] = summarizer.ensure_nltk_data(download=download)
+        except Exception as e:
+            report["errors"].append(str(e).splitlines()[0] if str(e) else repr(e))
+        else:
+            # Summaries silently fall back to period splitting without a sentence tokenizer
+            summarizer.get_context.cache_clear()
+            if summarizer.get_context().sentence_tokenizer is None:
+                report["errors"].append("NLTK Punkt sentence tokenizer could not be loaded; see the log for details.")
+    report["ready"] = not report["errors"]
+    return report
+
+def _marker_is_valid(report):
+    return (report.get("ready")
+            and report.get("python") == sys.executable
+            and report.get("packages") == _package_versions()
+            and all(os.path.exists(path) for path in report.get("nltk_resources", {}).values()))
+
+def _read_marker(marker_path):
+    try:
+        with open(marker_path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+def _write_marker(marker_path, report):
+    os.makedirs(os.path.dirname(marker_path) or ".", exist_ok=True)
+    tmp_path = f"{marker_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    os.replace(tmp_path, marker_path)
+
+def check_readiness(marker_path, download=False, install=False, refresh=False):
+    """Readiness report: {"ready", "packages", "nltk_resources", "errors", "checked_at", "cached"}.
+
+    A valid marker file is trusted without re-verifying; the result is also cached per
+    process. install runs pip for missing packages and download fetches missing NLTK data;
+    both are meant for an explicit setup step, not for request handling.
+    """
+    if not refresh:
+        report = _cached_reports.get(marker_path)
+        if report is not None and (report["ready"] or (
+                not (download or install) and time.time() - report["checked_at"] < RECHECK_SECONDS)):
+            return report
+        report = _read_marker(marker_path)
+        if report is not None and _marker_is_valid(report):
+            report["cached"] = True
+            _cached_reports[marker_path] = report
+            return report
+
+    if install:
+        install_required_packages()
+    report = _verify(download)
+    report["cached"] = False
+    if report["ready"]:
+        _write_marker(marker_path, report)
+    _cached_reports[marker_path] = report
+    return report
+
+def warmup(language="english"):
+    """Preload the sentence tokenizer, stopwords and extraction backends in this process.
+
+    Run it in the server's master process before workers are forked (see
+    gunicorn.conf.py): workers then share the loaded pages copy-on-write and their first
+    request is as fast as later ones. gc.freeze() keeps the garbage collector from
+    touching, and thereby copying, the preloaded objects in every worker.
+    """
+    import file_handler
+    import summarizer
+
+    started = time.perf_counter()
+    summarizer.warmup(language)
+    modules = file_handler.preload_backends()
+    gc.collect()
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+    elapsed = time.perf_counter() - started
+    print(f"Warmup complete in {elapsed:.2f}s (backends: {', '.join(modules) or 'none'})")
+    return elapsed
@@ -1,92 +1,282 @@
 import re
 import os
-import nltk
-from nltk.tokenize import sent_tokenize
-from nltk.corpus import stopwords
-from collections import defaultdict
+import heapq
+import tempfile
+from collections import defaultdict, deque
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from importlib.util import find_spec
 import logging
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def ensure_nltk_data():
-    """Ensure NLTK data is installed and available, with explicit downloading."""
-    nltk_data_dir = os.path.join(os.getcwd(), 'nltk_data')
-    os.makedirs(nltk_data_dir, exist_ok=True)
-    nltk.data.path.append(nltk_data_dir)
-    
-    required_resources = ['punkt', 'stopwords']
+# numpy/scipy and NLTK are imported on first use, so importing this module stays cheap.
+SCIPY_AVAILABLE = find_spec("numpy") is not None and find_spec("scipy") is not None
+if not SCIPY_AVAILABLE:
+    logger.warning("numpy/scipy not available, using pure-Python sentence scoring. Install with 'pip install numpy scipy'.")
+
+NLTK_DATA_DIR = os.path.join(os.getcwd(), 'nltk_data')
+NLTK_RESOURCES = {'stopwords': 'corpora/stopwords'}
+
+def _use_local_nltk_data():
+    """Import NLTK and add the project's nltk_data directory to its search path."""
+    import nltk
+
+    if NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.append(NLTK_DATA_DIR)
+    return nltk
+
+def _required_nltk_resources():
+    """NLTK resources to install; PunktTokenizer (NLTK 3.8.2+) reads punkt_tab, older releases the punkt pickles."""
+    try:
+        from nltk.tokenize import PunktTokenizer
+    except ImportError:
+        return {'punkt': 'tokenizers/punkt', **NLTK_RESOURCES}
+    return {'punkt_tab': 'tokenizers/punkt_tab', **NLTK_RESOURCES}
+
+def ensure_nltk_data(download=True):
+    """Ensure NLTK data is installed and available, with explicit downloading.
+
+    Returns a dict mapping each required resource to the path it was found at. This may
+    touch the network, so it is run by the startup readiness check rather than on import.
+    """
+    nltk = _use_local_nltk_data()
+    os.makedirs(NLTK_DATA_DIR, exist_ok=True)
     
-    for resource in required_resources:
+    found = {}
+    for resource, resource_path in _required_nltk_resources().items():
         try:
-            nltk.data.find(f'tokenizers/{resource}' if resource == 'punkt' else f'corpora/{resource}')
+            found[resource] = str(nltk.data.find(resource_path))
             logger.info(f"NLTK resource '{resource}' already available.")
+            continue
         except LookupError:
-            logger.info(f"Downloading NLTK resource '{resource}'...")
+            if not download:
+                raise LookupError(f"NLTK resource '{resource}' not found. Run 'python -m nltk.downloader {resource}'.") from None
+        logger.info(f"Downloading NLTK resource '{resource}'...")
+        try:
+            nltk.download(resource, download_dir=NLTK_DATA_DIR, quiet=False)
+            found[resource] = str(nltk.data.find(resource_path))
+            logger.info(f"NLTK resource '{resource}' downloaded successfully.")
+        except Exception as e:
+            logger.error(f"Failed to download NLTK resource '{resource}': {str(e)}")
+            raise Exception(f"Failed to download NLTK resource '{resource}'. Please check your internet connection or run 'python -m nltk.downloader {resource}' manually.")
+    return found
+
+WHITESPACE_RE = re.compile(r'\s+')
+WORD_SPLIT_RE = re.compile(r'\W+')
+PERIOD_SEGMENT_RE = re.compile(r'[^.]+')
+
+def _load_sentence_tokenizer(language):
+    """Load the Punkt sentence tokenizer, or None if the model is unavailable."""
+    nltk = _use_local_nltk_data()
+    try:
+        from nltk.tokenize import PunktTokenizer
+        return PunktTokenizer(language)
+    except (ImportError, LookupError):
+        # No PunktTokenizer, or no punkt_tab data: try the pickled model older releases use
+        pass
+    except Exception as e:
+        logger.error(f"Loading Punkt tokenizer failed: {str(e)}")
+        return None
+    try:
+        return nltk.data.load(f'tokenizers/punkt/{language}.pickle')
+    except Exception as e:
+        logger.error(f"Loading Punkt tokenizer failed: {str(e)}")
+        return None
+
+class SummarizerContext:
+    """Reusable per-process summarizer state: stopwords, compiled regexes and the Punkt model."""
+
+    def __init__(self, language='english'):
+        _use_local_nltk_data()
+        from nltk.corpus import stopwords
+
+        self.language = language
+        self.stop_words = frozenset(stopwords.words(language))
+        self.whitespace_re = WHITESPACE_RE
+        self.word_split_re = WORD_SPLIT_RE
+        self.sentence_tokenizer = _load_sentence_tokenizer(language)
+
+    def preprocess(self, text):
+        """Normalize whitespace."""
+        return self.whitespace_re.sub(' ', text.strip())
+
+    def sentence_spans(self, text):
+        """(start, end) offsets of the sentences in preprocessed text, falling back to period-based splitting."""
+        if self.sentence_tokenizer is not None:
             try:
-                nltk.download(resource, download_dir=nltk_data_dir, quiet=False)
-                logger.info(f"NLTK resource '{resource}' downloaded successfully.")
+                return list(self.sentence_tokenizer.span_tokenize(text))
             except Exception as e:
-                logger.error(f"Failed to download NLTK resource '{resource}': {str(e)}")
-                raise Exception(f"Failed to download NLTK resource '{resource}'. Please check your internet connection or run 'python -m nltk.downloader {resource}' manually.")
+                logger.error(f"Sentence tokenization failed: {str(e)}")
+        spans = []
+        for match in PERIOD_SEGMENT_RE.finditer(text):
+            segment = match.group()
+            stripped = segment.strip()
+            if stripped and len(stripped) > 1:
+                start = match.start() + len(segment) - len(segment.lstrip())
+                spans.append((start, start + len(stripped)))
+        return spans
+
+    def tokenize(self, sentences):
+        """Split each sentence into lowercase word tokens."""
+        split = self.word_split_re.split
+        return [[w.lower() for w in split(sentence) if w] for sentence in sentences]
+
+@lru_cache(maxsize=None)
+def get_context(language='english'):
+    """Return the process-wide SummarizerContext, creating it on first use."""
+    return SummarizerContext(language)
+
+def warmup(language='english'):
+    """Load the Punkt model, stopwords and numpy/scipy now and run one small summary.
+
+    Called before forking worker processes so they inherit the loaded state.
+    """
+    context = get_context(language)
+    sample = ("Warm up the summarizer before serving requests. The sentence tokenizer is loaded once. "
+              "Stopwords are loaded once. Scoring libraries are imported once.")
+    extractive_summary(sample, num_sentences=2, context=context)
+    return context
+
+class TokenizedDocument:
+    """A document segmented exactly once: normalized text, sentence spans and per-sentence tokens."""
+
+    def __init__(self, text, spans, context):
+        self.text = text
+        self.spans = spans
+        self.context = context
+        self._tokens = None
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __getitem__(self, index):
+        start, end = self.spans[index]
+        return self.text[start:end]
+
+    def __iter__(self):
+        text = self.text
+        return (text[start:end] for start, end in self.spans)
 
-ensure_nltk_data()
+    @property
+    def tokens(self):
+        """Lowercase word tokens per sentence, computed on first use."""
+        if self._tokens is None:
+            self._tokens = self.context.tokenize(self)
+        return self._tokens
+
+def tokenize_document(text, context=None):
+    """Normalize and sentence-segment text once so every summary mode can reuse the result."""
+    if isinstance(text, TokenizedDocument):
+        return text
+    context = context or get_context()
+    text = context.preprocess(text)
+    return TokenizedDocument(text, context.sentence_spans(text), context)
 
 def preprocess_text(text):
     """Clean text for summarization."""
-    text = re.sub(r'\s+', ' ', text.strip())  # Normalize whitespace
+    text = WHITESPACE_RE.sub(' ', text.strip())  # Normalize whitespace
     return text
 
-def extractive_summary(text, num_sentences=5):
-    """Improved extractive summary with stopword filtering."""
-    text = preprocess_text(text)
-    try:
-        sentences = sent_tokenize(text)
-    except Exception as e:
-        logger.error(f"Sentence tokenization failed: {str(e)}")
-        sentences = [s.strip() for s in text.split(".") if s.strip() and len(s.strip()) > 1]
-    
-    if not sentences or len(sentences) < 1:
-        return "No valid sentences found to summarize."
-    
-    if len(sentences) <= num_sentences:
-        return " ".join(sentences)
-    
-    stop_words = set(stopwords.words('english'))
-    word_freq = defaultdict(int)
-    for sentence in sentences:
-        words = [w.lower() for w in re.split(r'\W+', sentence) if w]
+def build_term_matrix(token_lists):
+    """Build a sentence-by-term count matrix with a vocabulary interned once."""
+    import numpy as np
+    from scipy.sparse import csr_matrix
+
+    vocabulary = {}
+    indices = []
+    indptr = [0]
+    for words in token_lists:
+        for word in words:
+            indices.append(vocabulary.setdefault(word, len(vocabulary)))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.int64)
+    matrix = csr_matrix((data, np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+                        shape=(len(token_lists), len(vocabulary)))
+    matrix.sum_duplicates()
+    return matrix, vocabulary
+
+def _score_sentences_vectorized(token_lists, stop_words):
+    """Frequency scores computed with one sparse matrix pass."""
+    import numpy as np
+
+    matrix, vocabulary = build_term_matrix(token_lists)
+    eligible = np.fromiter((word not in stop_words and len(word) > 1 for word in vocabulary),
+                           dtype=bool, count=len(vocabulary))
+    word_freq = np.asarray(matrix.sum(axis=0)).ravel() * eligible
+    totals = matrix @ word_freq
+    lengths = np.fromiter((len(words) for words in token_lists), dtype=np.int64, count=len(token_lists))
+    return totals / np.maximum(lengths, 1)
+
+def _count_word_frequencies(token_lists, stop_words, word_freq=None):
+    """Count non-stopword terms longer than one character."""
+    word_freq = defaultdict(int) if word_freq is None else word_freq
+    for words in token_lists:
         for word in words:
             if word not in stop_words and len(word) > 1:
                 word_freq[word] += 1
+    return word_freq
+
+def _sentence_score(words, word_freq, stop_words):
+    """Average term frequency of one tokenized sentence."""
+    if not words:
+        return 0
+    score = sum(word_freq.get(word, 0) for word in words if word not in stop_words)
+    return score / max(len(words), 1)
+
+def _score_sentences_python(token_lists, stop_words):
+    """Pure-Python frequency scores, used when numpy/scipy are missing."""
+    word_freq = _count_word_frequencies(token_lists, stop_words)
+    return [_sentence_score(words, word_freq, stop_words) for words in token_lists]
+
+def score_sentences(token_lists, stop_words):
+    """Score sentences by the average corpus frequency of their non-stopword terms."""
+    if SCIPY_AVAILABLE and token_lists:
+        return _score_sentences_vectorized(token_lists, stop_words)
+    return _score_sentences_python(token_lists, stop_words)
+
+def select_top_sentences(sentence_scores, num_sentences):
+    """Indices of the highest scoring sentences in document order (ties keep the earlier sentence)."""
+    if SCIPY_AVAILABLE:
+        import numpy as np
+
+        top_indices = np.argsort(-np.asarray(sentence_scores, dtype=float), kind="stable")[:num_sentences].tolist()
+    else:
+        top_indices = sorted(range(len(sentence_scores)), key=sentence_scores.__getitem__, reverse=True)[:num_sentences]
+    top_indices.sort()
+    return top_indices
+
+def extractive_summary(text, num_sentences=5, context=None):
+    """Improved extractive summary with stopword filtering.
+
+    Accepts raw text or a TokenizedDocument from tokenize_document().
+    """
+    document = tokenize_document(text, context)
     
-    sentence_scores = {}
-    for i, sentence in enumerate(sentences):
-        words = [w.lower() for w in re.split(r'\W+', sentence) if w]
-        if not words:
-            sentence_scores[i] = 0
-        else:
-            score = sum(word_freq.get(word, 0) for word in words if word not in stop_words)
-            sentence_scores[i] = score / max(len(words), 1)
+    if not document or len(document) < 1:
+        return "No valid sentences found to summarize."
     
-    top_indices = sorted(sentence_scores, key=sentence_scores.get, reverse=True)[:num_sentences]
-    top_indices.sort()
-    return " ".join(sentences[i] for i in top_indices)
+    if len(document) <= num_sentences:
+        return " ".join(document)
+    
+    sentence_scores = score_sentences(document.tokens, document.context.stop_words)
+    top_indices = select_top_sentences(sentence_scores, num_sentences)
+    return " ".join(document[i] for i in top_indices)
 
-def abstractive_summary(text, max_length=150):
-    """Improved abstractive summary using key sentence selection."""
-    text = preprocess_text(text)
-    try:
-        sentences = sent_tokenize(text)
-    except Exception as e:
-        logger.error(f"Sentence tokenization failed: {str(e)}")
-        sentences = [s.strip() for s in text.split(".") if s.strip() and len(s.strip()) > 1]
+def abstractive_summary(text, max_length=150, context=None):
+    """Improved abstractive summary using key sentence selection.
+
+    Accepts raw text or a TokenizedDocument from tokenize_document().
+    """
+    document = tokenize_document(text, context)
     
-    if not sentences:
+    if not document:
         return "No valid sentences found to summarize."
     
-    temp_summary = extractive_summary(text, num_sentences=3)
+    temp_summary = extractive_summary(document, num_sentences=3)
     summary = temp_summary
     
     if len(summary) > max_length:
@@ -94,12 +284,349 @@ def abstractive_summary(text, max_length=150):
     
     return summary
 
-def batch_summarization(texts, summary_type="extractive", num_sentences=5, max_length=150):
-    """Process multiple texts."""
-    summaries = {}
-    for file_name, text in texts.items():
-        if summary_type == "abstractive":
-            summaries[file_name] = abstractive_summary(text, max_length)
+# Graph-based (TextRank/LexRank) ranking: each sentence keeps its TEXTRANK_TOP_K most
+# similar neighbours above TEXTRANK_THRESHOLD cosine similarity. Similarities are
+# computed for blocks of about TEXTRANK_BLOCK_ENTRIES sentence pairs at a time.
+TEXTRANK_TOP_K = 20
+TEXTRANK_THRESHOLD = 0.1
+TEXTRANK_BLOCK_ENTRIES = 8 * 1024 * 1024
+# Terms in more than this fraction of sentences link most sentence pairs, so their part
+# of the similarity is a dense matrix product; rarer terms stay sparse
+TEXTRANK_DENSE_TERM_FRACTION = 0.03
+TEXTRANK_DAMPING = 0.85
+# Longer documents fall back to frequency scoring
+TEXTRANK_MAX_SENTENCES = 50000
+
+def tfidf_matrix(token_lists, stop_words):
+    """L2-normalized sentence-by-term TF-IDF matrix over non-stopword terms longer than one character."""
+    import numpy as np
+    from scipy.sparse import diags
+
+    matrix, vocabulary = build_term_matrix(token_lists)
+    eligible = np.fromiter((word not in stop_words and len(word) > 1 for word in vocabulary),
+                           dtype=bool, count=len(vocabulary))
+    matrix = matrix[:, np.flatnonzero(eligible)].astype(np.float64)
+    document_freq = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    idf = np.log((1 + matrix.shape[0]) / (1 + document_freq)) + 1
+    matrix = matrix @ diags(idf)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    return (diags(1 / np.maximum(norms, 1e-12)) @ matrix).tocsr()
+
+def similarity_graph(vectors, top_k=TEXTRANK_TOP_K, threshold=TEXTRANK_THRESHOLD,
+                     block_entries=TEXTRANK_BLOCK_ENTRIES):
+    """Sparse symmetric cosine similarity graph between the rows of L2-normalized vectors.
+
+    Rows are processed in blocks: a block's similarities to every sentence are the
+    dense product over frequent terms plus the sparse product over the rest, and only
+    each row's top_k strongest edges at or above threshold are kept (all of them if
+    top_k is 0). Self-loops are dropped.
+    """
+    import numpy as np
+    from scipy.sparse import csr_matrix
+
+    count = vectors.shape[0]
+    vectors = vectors.tocsc().astype(np.float32)
+    document_freq = np.diff(vectors.indptr)
+    frequent = document_freq > count * TEXTRANK_DENSE_TERM_FRACTION
+    dense = vectors[:, np.flatnonzero(frequent)].toarray()
+    dense_transposed = np.ascontiguousarray(dense.T)
+    rare = vectors[:, np.flatnonzero(~frequent)].tocsr()
+    rare_transposed = rare.T.tocsc()
+    block_rows = max(1, block_entries // max(count, 1))
+    rows, cols, weights = [], [], []
+    for block_start in range(0, count, block_rows):
+        block_end = min(block_start + block_rows, count)
+        similarity = dense[block_start:block_end] @ dense_transposed
+        similarity += (rare[block_start:block_end] @ rare_transposed).toarray()
+        np.fill_diagonal(similarity[:, block_start:block_end], 0)
+        flat = np.flatnonzero(similarity >= threshold)
+        row, col = np.divmod(flat, count)
+        data = similarity.ravel()[flat]
+        if top_k:
+            # Sort by row, strongest edge first, then keep each row's first top_k
+            order = np.argsort(row - data.astype(np.float64) / 2, kind="stable")
+            row, col, data = row[order], col[order], data[order]
+            rank = np.arange(len(row)) - np.searchsorted(row, row)
+            keep = rank < top_k
+            row, col, data = row[keep], col[keep], data[keep]
+        rows.append(row + block_start)
+        cols.append(col)
+        weights.append(data.astype(np.float64))
+    graph = csr_matrix((np.concatenate(weights or [np.empty(0)]),
+                        (np.concatenate(rows or [np.empty(0, dtype=np.int64)]),
+                         np.concatenate(cols or [np.empty(0, dtype=np.int64)]))), shape=(count, count))
+    return graph.maximum(graph.T)
+
+def pagerank(graph, damping=TEXTRANK_DAMPING, tolerance=1e-6, max_iterations=100):
+    """Weighted PageRank of a sparse graph by power iteration; dangling nodes link to every node."""
+    import numpy as np
+    from scipy.sparse import diags
+
+    count = graph.shape[0]
+    out_weight = np.asarray(graph.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    transition = (diags(1 / np.where(dangling, 1, out_weight)) @ graph).T.tocsr()
+    ranks = np.full(count, 1 / count)
+    for _ in range(max_iterations):
+        updated = damping * (transition @ ranks + ranks[dangling].sum() / count) + (1 - damping) / count
+        converged = np.abs(updated - ranks).sum() < tolerance
+        ranks = updated
+        if converged:
+            break
+    return ranks
+
+def textrank_scores(token_lists, stop_words, top_k=TEXTRANK_TOP_K, threshold=TEXTRANK_THRESHOLD):
+    """Centrality of each sentence in the TF-IDF cosine similarity graph (LexRank with weighted edges)."""
+    return pagerank(similarity_graph(tfidf_matrix(token_lists, stop_words), top_k, threshold))
+
+def textrank_summary(text, num_sentences=5, context=None):
+    """Graph-based extractive summary: the most central sentences of the similarity graph.
+
+    Accepts raw text or a TokenizedDocument from tokenize_document(). Falls back to
+    frequency scoring without numpy/scipy or above TEXTRANK_MAX_SENTENCES sentences.
+    """
+    document = tokenize_document(text, context)
+    
+    if not document or len(document) < 1:
+        return "No valid sentences found to summarize."
+    
+    if len(document) <= num_sentences:
+        return " ".join(document)
+    
+    if not SCIPY_AVAILABLE or len(document) > TEXTRANK_MAX_SENTENCES:
+        logger.info("Using frequency scoring instead of TextRank for this document.")
+        return extractive_summary(document, num_sentences)
+    
+    sentence_scores = textrank_scores(document.tokens, document.context.stop_words)
+    top_indices = select_top_sentences(sentence_scores, num_sentences)
+    return " ".join(document[i] for i in top_indices)
+
+def _textrank_sentence_stream(sentences, num_sentences, context, fallback):
+    """TextRank over streamed sentences, collected in memory up to TEXTRANK_MAX_SENTENCES.
+
+    Longer streams are handed to fallback(sentences) with the collected sentences put back in front.
+    """
+    collected = []
+    for sentence in sentences:
+        collected.append(sentence)
+        if len(collected) > TEXTRANK_MAX_SENTENCES:
+            logger.info("Stream too long for TextRank, using frequency scoring.")
+            return fallback(chain(collected, sentences))
+    if not collected:
+        return "No valid sentences found to summarize."
+    text = " ".join(collected)
+    spans = []
+    position = 0
+    for sentence in collected:
+        spans.append((position, position + len(sentence)))
+        position += len(sentence) + 1
+    return textrank_summary(TokenizedDocument(text, spans, context), num_sentences)
+
+# A streamed "sentence" is cut here if no boundary turns up (e.g. logs without periods),
+# so the text carried between chunks stays bounded
+STREAM_MAX_SENTENCE_CHARS = 64 * 1024
+
+def iter_stream_sentences(chunks, context=None, max_sentence_chars=STREAM_MAX_SENTENCE_CHARS):
+    """Yield sentences from an iterable of text chunks (e.g. PDF pages) without joining them.
+
+    The trailing sentence of each chunk is carried into the next one, since it may
+    continue there; text without a boundary is emitted every max_sentence_chars.
+    """
+    context = context or get_context()
+    carry = ""
+    for chunk in chunks:
+        text = context.preprocess(f"{carry} {chunk}" if carry else chunk)
+        spans = context.sentence_spans(text)
+        if not spans:
+            carry = text
+        else:
+            for start, end in spans[:-1]:
+                yield text[start:end]
+            carry = text[spans[-1][0]:]
+        while len(carry) > max_sentence_chars:
+            yield carry[:max_sentence_chars]
+            carry = carry[max_sentence_chars:]
+    if carry:
+        for start, end in context.sentence_spans(carry):
+            yield carry[start:end]
+
+def _top_sentences(sentences, word_freq, num_sentences, context):
+    """The num_sentences best-scoring sentences in document order, keeping only those in memory."""
+    best = []
+    for index, sentence in enumerate(sentences):
+        score = _sentence_score(context.tokenize([sentence])[0], word_freq, context.stop_words)
+        item = (score, -index, sentence)
+        if len(best) < num_sentences:
+            heapq.heappush(best, item)
         else:
-            summaries[file_name] = extractive_summary(text, num_sentences)
-    return summaries
\ No newline at end of file
+            heapq.heappushpop(best, item)
+    best.sort(key=lambda item: -item[1])
+    return " ".join(sentence for _, _, sentence in best)
+
+def extractive_summary_stream(chunks, num_sentences=5, context=None):
+    """Extractive summary of a chunk stream (e.g. file_handler.iter_pdf_pages) in bounded memory.
+
+    The first pass counts word frequencies and spools sentences to a temporary file; the
+    second pass scores the spooled sentences and keeps only the best num_sentences.
+    Scores match extractive_summary, though sentence boundaries can differ at chunk edges.
+    """
+    context = context or get_context()
+    return _spooled_extractive_summary(iter_stream_sentences(chunks, context), num_sentences, context)
+
+def _spooled_extractive_summary(sentences, num_sentences, context):
+    """extractive_summary_stream over already segmented sentences."""
+    stop_words = context.stop_words
+    word_freq = defaultdict(int)
+    sentence_count = 0
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8", newline="\n") as spool:
+        for sentence in sentences:
+            spool.write(sentence + "\n")
+            _count_word_frequencies(context.tokenize([sentence]), stop_words, word_freq)
+            sentence_count += 1
+        
+        if not sentence_count:
+            return "No valid sentences found to summarize."
+        
+        spool.seek(0)
+        sentences = (line.rstrip("\n") for line in spool)
+        if sentence_count <= num_sentences:
+            return " ".join(sentences)
+        return _top_sentences(sentences, word_freq, num_sentences, context)
+
+def extractive_summary_two_pass(open_chunks, num_sentences=5, context=None):
+    """Extractive summary of a source that can be read twice, such as a memory-mapped file.
+
+    open_chunks() returns a new iterator over the same text chunks on each call (e.g.
+    lambda: file_handler.iter_txt_chunks(path)). The first pass only counts word
+    frequencies and the second scores sentences against them, so nothing is spooled and
+    memory use is independent of the input size.
+    """
+    context = context or get_context()
+    word_freq = defaultdict(int)
+    sentence_count = 0
+    for sentence in iter_stream_sentences(open_chunks(), context):
+        _count_word_frequencies(context.tokenize([sentence]), context.stop_words, word_freq)
+        sentence_count += 1
+    if not sentence_count:
+        return "No valid sentences found to summarize."
+    return _top_sentences(iter_stream_sentences(open_chunks(), context), word_freq, num_sentences, context)
+
+def abstractive_summary_stream(chunks, max_length=150, context=None):
+    """Abstractive summary of a chunk stream using key sentence selection."""
+    summary = extractive_summary_stream(chunks, num_sentences=3, context=context)
+    if len(summary) > max_length:
+        summary = summary[:max_length-3] + "..."
+    return summary
+
+def summarize_stream(chunks, summary_type="extractive", num_sentences=5, max_length=150, context=None):
+    """Summarize a chunk stream with the requested summary type."""
+    if summary_type == "textrank":
+        context = context or get_context()
+        return _textrank_sentence_stream(iter_stream_sentences(chunks, context), num_sentences, context,
+                                         lambda sentences: _spooled_extractive_summary(sentences, num_sentences, context))
+    if summary_type == "abstractive":
+        return abstractive_summary_stream(chunks, max_length, context=context)
+    return extractive_summary_stream(chunks, num_sentences, context=context)
+
+def summarize_two_pass(open_chunks, summary_type="extractive", num_sentences=5, max_length=150, context=None):
+    """Summarize a re-readable chunk source (see extractive_summary_two_pass) with the requested summary type."""
+    if summary_type == "textrank":
+        context = context or get_context()
+        return _textrank_sentence_stream(
+            iter_stream_sentences(open_chunks(), context), num_sentences, context,
+            lambda sentences: extractive_summary_two_pass(open_chunks, num_sentences, context=context))
+    if summary_type == "abstractive":
+        summary = extractive_summary_two_pass(open_chunks, num_sentences=3, context=context)
+        if len(summary) > max_length:
+            summary = summary[:max_length-3] + "..."
+        return summary
+    return extractive_summary_two_pass(open_chunks, num_sentences, context=context)
+
+def summarize(text, summary_type="extractive", num_sentences=5, max_length=150, context=None):
+    """Summarize one text with the requested summary type."""
+    if summary_type == "textrank":
+        return textrank_summary(text, num_sentences, context=context)
+    if summary_type == "abstractive":
+        return abstractive_summary(text, max_length, context=context)
+    return extractive_summary(text, num_sentences, context=context)
+
+def _summarize_batch_item(text, summary_type, num_sentences, max_length, context=None, language='english'):
+    """Summarize one batch entry; pool workers pass language instead of a context and use their process-wide one."""
+    context = context or get_context(language)
+    return summarize(text, summary_type, num_sentences, max_length, context=context)
+
+def _record_batch_result(summaries, failures, on_result, file_name, summary_text=None, error=None):
+    """Store one file's summary, or log its failure and report it in failures (or as an "Error summarizing ..." summary)."""
+    if error is None:
+        summaries[file_name] = summary_text
+    else:
+        logger.error(f"Summarization failed for {file_name}: {str(error)}")
+        if failures is None:
+            summaries[file_name] = f"Error summarizing {file_name}: {str(error)}"
+        else:
+            failures[file_name] = str(error)
+    if on_result is not None:
+        on_result(file_name, summary_text, error)
+
+def _pool_context():
+    """forkserver (or spawn) multiprocessing context for the batch pool.
+
+    batch_summarization is called from server threads; forking them could copy a lock
+    held by another thread, such as the logging lock, into a worker that then hangs.
+    """
+    import multiprocessing
+
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+def _init_batch_worker(language):
+    """Process pool initializer: load NLTK data and the stopword set once per worker."""
+    get_context(language)
+
+def batch_summarization(texts, summary_type="extractive", num_sentences=5, max_length=150, context=None,
+                        workers=None, max_in_flight=None, failures=None, on_result=None):
+    """Process multiple texts: a dict of file name -> text, or an iterable of (file name, text) pairs.
+
+    Pairs are consumed as they arrive (e.g. from file_handler.iter_batch_extract_text), so
+    summarizing starts before the last document is extracted. With workers > 1 documents
+    are fanned out to a process pool. Results keep the
+    input order, at most max_in_flight documents (default workers * 4) are queued
+    at once, and a failing file does not abort the batch: it is left out of the result
+    and its error message stored in the failures dict if one is given, or returned as an
+    "Error summarizing ..." entry otherwise. on_result(file_name, summary_text, error) is
+    called as each file's result is collected, e.g. to report progress.
+    """
+    context = context or get_context()
+    items = texts.items() if hasattr(texts, "items") else texts
+    summaries = {}
+    if not workers or workers <= 1:
+        for file_name, text in items:
+            try:
+                summary_text = _summarize_batch_item(text, summary_type, num_sentences, max_length, context=context)
+            except Exception as e:
+                _record_batch_result(summaries, failures, on_result, file_name, error=e)
+            else:
+                _record_batch_result(summaries, failures, on_result, file_name, summary_text)
+        return summaries
+
+    max_in_flight = max_in_flight or workers * 4
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context(), initializer=_init_batch_worker,
+                             initargs=(context.language,)) as executor:
+        for file_name, text in items:
+            if len(pending) >= max_in_flight:
+                _collect_batch_result(summaries, failures, on_result, *pending.popleft())
+            pending.append((file_name, executor.submit(_summarize_batch_item, text, summary_type,
+                                                       num_sentences, max_length, language=context.language)))
+        while pending:
+            _collect_batch_result(summaries, failures, on_result, *pending.popleft())
+    return summaries
+
+def _collect_batch_result(summaries, failures, on_result, file_name, future):
+    """Store a pool result, recording summarization and pool-level failures against the file."""
+    try:
+        summary_text = future.result()
+    except Exception as e:
+        _record_batch_result(summaries, failures, on_result, file_name, error=e)
+    else:
+        _record_batch_result(summaries, failures, on_result, file_name, summary_text)
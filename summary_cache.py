@@ -0,0 +1,106 @@
+import hashlib
+import json
+import threading
+import time
+
+from sqlalchemy.exc import IntegrityError
+
+import summarizer
+
+class SummaryCache:
+    """Summary results cached in a database table.
+
+    Entries are keyed by the digest of the normalized document text, the summary type and
+    the parameters that affect it. Entries older than ttl_seconds are dropped, and the
+    least recently used entries are evicted beyond max_entries; eviction runs every
+    evict_every stores, so the table can briefly exceed max_entries by about that many
+    entries per process. Hit/miss counters are kept per process.
+    """
+
+    def __init__(self, db, model, ttl_seconds=7 * 24 * 3600, max_entries=10000, evict_every=100):
+        self.db = db
+        self.model = model
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.puts = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text, summary_type="extractive", num_sentences=5, max_length=150):
+        """Cache key for a document and the parameters its summary depends on."""
+        text_digest = hashlib.sha256(summarizer.preprocess_text(text).encode("utf-8")).hexdigest()
+        if summary_type == "abstractive":
+            parameters = {"max_length": max_length}
+        else:
+            parameters = {"num_sentences": num_sentences}
+        payload = json.dumps([text_digest, summary_type, parameters], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Cached summary for key, or None if missing or expired."""
+        now = time.time()
+        entry = self.db.session.get(self.model, key)
+        if entry is None or entry.created_at < now - self.ttl_seconds:
+            self._count("misses")
+            return None
+        entry.last_used_at = now
+        self.db.session.commit()
+        self._count("hits")
+        return entry.summary_text
+
+    def put(self, key, summary_text):
+        """Store a summary, evicting expired or excess entries every evict_every stores."""
+        now = time.time()
+        self.db.session.merge(self.model(cache_key=key, summary_text=summary_text,
+                                         created_at=now, last_used_at=now))
+        try:
+            self.db.session.commit()
+        except IntegrityError:
+            # Another worker stored the same key concurrently; its entry is equivalent.
+            self.db.session.rollback()
+            return
+        with self._lock:
+            self.puts += 1
+            due = self.puts % self.evict_every == 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        """Delete expired entries, then the least recently used ones above max_entries."""
+        model = self.model
+        removed = model.query.filter(model.created_at < time.time() - self.ttl_seconds).delete(
+            synchronize_session=False)
+        excess = model.query.count() - self.max_entries
+        if excess > 0:
+            oldest = [key for key, in self.db.session.query(model.cache_key)
+                      .order_by(model.last_used_at).limit(excess)]
+            removed += model.query.filter(model.cache_key.in_(oldest)).delete(synchronize_session=False)
+        self.db.session.commit()
+        if removed:
+            self._count("evictions", removed)
+
+    def summarize(self, text, summary_type="extractive", num_sentences=5, max_length=150, context=None):
+        """summarizer.summarize() served from the cache when possible."""
+        key = self.make_key(text, summary_type, num_sentences, max_length)
+        summary_text = self.get(key)
+        if summary_text is None:
+            summary_text = summarizer.summarize(text, summary_type, num_sentences, max_length, context=context)
+            self.put(key, summary_text)
+        return summary_text
+
+    def stats(self):
+        """Hit/miss counters of this process, plus the table's entry count, for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                     "hit_rate": self.hits / lookups if lookups else 0.0}
+        stats["entries"] = self.model.query.count()
+        return stats
+
+    def _count(self, counter, amount=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
@@ -1,51 +1,289 @@
-from flask import Flask, request, render_template, redirect, url_for, session, flash
+from flask import Blueprint, Flask, Request, current_app, request, render_template, redirect, url_for, session, flash, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
+import json
 import os
+import secrets
 import sys
-import subprocess
-import traceback
+import time
 
-def install_required_packages():
-    """Install required packages."""
-    packages = ['nltk', 'pdfplumber', 'python-docx']
-    for package in packages:
+import file_handler
+import summarizer
+from summary_cache import SummaryCache
+from jobs import JobQueue, JOB_QUEUED, JOB_DONE, JOB_FAILED
+from migrations import run_migrations
+import storage
+import startup
+from repository import SummaryRepository
+
+DEFAULT_CONFIG = {
+    'MAX_CONTENT_LENGTH': int(os.environ.get("MAX_UPLOAD_MB", 16)) * 1024 * 1024,
+    'UPLOAD_EXTENSIONS': ['.pdf', '.docx', '.txt'],
+    'PDF_BACKEND': 'auto',
+    'EXTRACTION_CACHE_MAX_BYTES': 256 * 1024 * 1024,
+    'SUMMARY_CACHE_TTL': 7 * 24 * 3600,
+    'SUMMARY_CACHE_MAX_ENTRIES': 10000,
+    'SUMMARY_CACHE_EVICT_EVERY': 100,
+    'JOB_WORKERS': 2,
+    'JOB_PROGRESS_INTERVAL': 0.5,
+    'JOB_STALE_AFTER': 15 * 60,
+    'HISTORY_PAGE_SIZE': 20,
+    'HISTORY_PREVIEW_CHARS': 200,
+    'SQLITE_PROFILE': 'concurrent',
+    'DB_POOL_SIZE': 5,
+    'DB_MAX_OVERFLOW': 10,
+    'BATCH_EXTENSIONS': ['.zip'],
+    'BATCH_MAX_FILES': 100,
+    'BATCH_MAX_BYTES': 512 * 1024 * 1024,
+    # Extraction and summarization processes per batch, each; batches run in every server worker
+    'BATCH_WORKERS': max(1, (os.cpu_count() or 2) // 2),
+    'BATCH_FILE_TIMEOUT': 300,
+    'BATCH_FILE_MEMORY_LIMIT': 2 * 1024 * 1024 * 1024,
+    'STREAM_TXT_MIN_BYTES': 32 * 1024 * 1024,
+}
+
+db = SQLAlchemy()
+bp = Blueprint("main", __name__)
+
+class UploadRequest(Request):
+    """Request that streams uploaded files straight into UPLOAD_DIR, hashing them on the way.
+
+    Werkzeug hands the multipart parser's chunks to the stream returned here, so an
+    upload is written to disk once, in constant memory, whatever MAX_CONTENT_LENGTH is.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        upload_dir = current_app.config['UPLOAD_DIR']
+        os.makedirs(upload_dir, exist_ok=True)
+        return file_handler.HashingFile(upload_dir)
+
+def load_secret_key(path):
+    """Secret key stored in path, generated on first use.
+
+    Every worker of a multi-process server reads the same file, so a session cookie
+    signed by one worker is accepted by the others and across restarts. The key is
+    written to a temporary file and linked into place, so workers starting at the same
+    time all end up with the key of whichever one linked first.
+    """
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as file:
+            file.write(secrets.token_hex(32))
         try:
-            __import__(package.replace("-", "_"))
-        except ImportError:
-            print(f"Installing {package}...")
-            subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-            print(f"{package} installed.")
+            os.link(tmp_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp_path)
+    with open(path, encoding="utf-8") as file:
+        return file.read().strip()
 
-install_required_packages()
+def create_app(config=None):
+    """Create and configure an application instance.
 
-import file_handler
-import summarizer
+    config is a mapping of settings overriding DEFAULT_CONFIG and the environment
+    (SECRET_KEY, DATABASE_URL). Without a SECRET_KEY, one is kept in instance/secret_key
+    and shared by all workers. Each app gets its own extraction cache, summary cache and
+    job queues (see extraction_cache(), summary_cache(), job_queue() and batch_queue()).
+    """
+    app = Flask(__name__)
+    app.request_class = UploadRequest
+    app.config.update(DEFAULT_CONFIG)
+    app.config['SQLALCHEMY_DATABASE_URI'] = storage.normalize_database_url(os.environ.get("DATABASE_URL", "sqlite:///app.db"))
+    if os.environ.get("SECRET_KEY"):
+        app.config['SECRET_KEY'] = os.environ["SECRET_KEY"]
+    app.config.update(config or {})
+    app.config['SQLALCHEMY_DATABASE_URI'] = storage.normalize_database_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    app.config.setdefault('UPLOAD_DIR', os.path.join(app.instance_path, 'uploads'))
+    app.config.setdefault('EXTRACTION_CACHE_DIR', os.path.join(app.instance_path, 'extraction_cache'))
+    app.config.setdefault('READINESS_MARKER', os.path.join(app.instance_path, 'readiness.json'))
+    app.config.setdefault('SECRET_KEY_FILE', os.path.join(app.instance_path, 'secret_key'))
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', storage.engine_options(app.config['SQLALCHEMY_DATABASE_URI'], app.config))
+    os.makedirs(app.instance_path, exist_ok=True)
+    if not app.config.get('SECRET_KEY'):
+        app.config['SECRET_KEY'] = load_secret_key(app.config['SECRET_KEY_FILE'])
+
+    db.init_app(app)
+    with app.app_context():
+        storage.apply_sqlite_profile(db.engine, storage.sqlite_pragmas(app.config))
 
-app = Flask(__name__)
-app.secret_key = os.urandom(24)
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///app.db"
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
-app.config['UPLOAD_EXTENSIONS'] = ['.pdf', '.docx', '.txt']
+    app.extensions['extraction_cache'] = file_handler.ExtractionCache(app.config['EXTRACTION_CACHE_DIR'],
+                                                                      app.config['EXTRACTION_CACHE_MAX_BYTES'])
+    app.extensions['summary_cache'] = SummaryCache(db, SummaryCacheEntry, app.config['SUMMARY_CACHE_TTL'],
+                                                   app.config['SUMMARY_CACHE_MAX_ENTRIES'],
+                                                   app.config['SUMMARY_CACHE_EVICT_EVERY'])
+    app.extensions['job_queue'] = JobQueue(app, db, Job, process_upload_job, workers=app.config['JOB_WORKERS'],
+                                           stale_after=app.config['JOB_STALE_AFTER'])
+    app.extensions['batch_queue'] = JobQueue(app, db, Batch, process_batch, workers=1,
+                                             stale_after=app.config['JOB_STALE_AFTER'])
+    app.register_blueprint(bp)
+    return app
 
-os.makedirs('instance', exist_ok=True)
-os.makedirs('templates', exist_ok=True)
+def extraction_cache():
+    return current_app.extensions['extraction_cache']
 
-db = SQLAlchemy(app)
+def summary_cache():
+    return current_app.extensions['summary_cache']
+
+def job_queue():
+    return current_app.extensions['job_queue']
+
+def batch_queue():
+    return current_app.extensions['batch_queue']
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(150), unique=True, nullable=False)
     password = db.Column(db.String(200), nullable=False)
+    created_at = db.Column(db.Float, default=time.time)
 
 class Summary(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
     file_name = db.Column(db.String(255), nullable=False)
     summary_text = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.Float, default=time.time)
+    content_hash = db.Column(db.String(64), index=True)
+    parameters = db.Column(db.Text)
+
+class SummaryCacheEntry(db.Model):
+    __tablename__ = "summary_cache"
+    cache_key = db.Column(db.String(64), primary_key=True)
+    summary_text = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.Float, nullable=False)
+    last_used_at = db.Column(db.Float, nullable=False, index=True)
+
+class Job(db.Model):
+    id = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    file_name = db.Column(db.String(255), nullable=False)
+    file_path = db.Column(db.String(1024), nullable=False)
+    content_hash = db.Column(db.String(64))
+    summary_type = db.Column(db.String(20), nullable=False)
+    num_sentences = db.Column(db.Integer, nullable=False)
+    max_length = db.Column(db.Integer, nullable=False)
+    pdf_backend = db.Column(db.String(20))
+    status = db.Column(db.String(20), nullable=False, index=True)
+    pages_done = db.Column(db.Integer, nullable=False, default=0)
+    pages_total = db.Column(db.Integer)
+    message = db.Column(db.Text)
+    summary_id = db.Column(db.Integer, db.ForeignKey("summary.id"))
+    created_at = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.Float, nullable=False)
+
+class Batch(db.Model):
+    id = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    folder_path = db.Column(db.String(1024), nullable=False)
+    summary_type = db.Column(db.String(20), nullable=False)
+    num_sentences = db.Column(db.Integer, nullable=False)
+    max_length = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(20), nullable=False, index=True)
+    files_total = db.Column(db.Integer, nullable=False, default=0)
+    files_done = db.Column(db.Integer, nullable=False, default=0)
+    message = db.Column(db.Text)
+    created_at = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.Float, nullable=False)
+
+class BatchFile(db.Model):
+    __tablename__ = "batch_file"
+    id = db.Column(db.Integer, primary_key=True)
+    batch_id = db.Column(db.String(32), db.ForeignKey("batch.id"), nullable=False, index=True)
+    file_name = db.Column(db.String(255), nullable=False)
+    content_hash = db.Column(db.String(64))
+    status = db.Column(db.String(20), nullable=False)
+    message = db.Column(db.Text)
+    summary_id = db.Column(db.Integer, db.ForeignKey("summary.id"))
+
+summary_repository = SummaryRepository(db.session, Summary)
+
+def summary_parameters(summary_type, num_sentences, max_length):
+    """The parameters column of a Summary: the settings it was generated with, as JSON."""
+    return json.dumps({"summary_type": summary_type, "num_sentences": num_sentences, "max_length": max_length})
+
+def process_upload_job(job, queue):
+    """Extract and summarize an uploaded file, recording per-page progress on the job."""
+    last_report = [0.0]
+
+    def report_progress(pages_done, pages_total):
+        now = time.monotonic()
+        if pages_done == pages_total or now - last_report[0] >= current_app.config['JOB_PROGRESS_INTERVAL']:
+            last_report[0] = now
+            queue.update(job, pages_done=pages_done, pages_total=pages_total)
+
+    if (job.file_path.lower().endswith(".txt")
+            and os.path.getsize(job.file_path) >= current_app.config['STREAM_TXT_MIN_BYTES']):
+        # Very large plain text is summarized from the memory-mapped file in two passes, never loaded whole
+        summary_text = summarizer.summarize_two_pass(lambda: file_handler.iter_txt_chunks(job.file_path),
+                                                     job.summary_type, job.num_sentences, job.max_length)
+    else:
+        result = file_handler.extract_cached(job.file_path, extraction_cache(), backend=job.pdf_backend,
+                                             digest=job.content_hash, progress=report_progress)
+        if not result.ok:
+            queue.update(job, status=JOB_FAILED, message=f"Text extraction failed: {result.error}")
+            return
+
+        print(f"Extracted {len(result.segment_ends)} segments, {len(result.text)} chars with {result.backend} "
+              f"in {result.elapsed:.2f}s{' (cached)' if result.cached else ''}")
+        summary_text = summary_cache().summarize(result.text, job.summary_type, job.num_sentences, job.max_length)
+
+    print(f"Summary (first 300 chars): {summary_text[:300] if summary_text else 'None'}")
+    if not summary_text or summary_text.startswith("No valid") or len(summary_text.strip()) < 20:
+        queue.update(job, status=JOB_FAILED, message=f"Summary generation failed: {summary_text[:100] if summary_text else 'No summary'}...")
+        return
+
+    parameters = summary_parameters(job.summary_type, job.num_sentences, job.max_length)
+    new_summary = summary_repository.add(user_id=job.user_id, file_name=job.file_name, summary_text=summary_text,
+                                         content_hash=job.content_hash, parameters=parameters)
+    queue.update(job, status=JOB_DONE, summary_id=new_summary.id, message="File processed successfully!")
+
+def process_batch(batch, queue):
+    """Extract and summarize every file of a batch upload, storing each summary as soon as it is ready."""
+    files = {entry.file_name: entry for entry in BatchFile.query.filter_by(batch_id=batch.id, status=JOB_QUEUED)}
+    parameters = summary_parameters(batch.summary_type, batch.num_sentences, batch.max_length)
+    summarized = []
 
-@app.route("/login", methods=["GET", "POST"])
+    def fail(entry, message):
+        entry.status = JOB_FAILED
+        entry.message = message
+        queue.update(batch, files_done=batch.files_done + 1)
+
+    def extracted_texts():
+        # Files are summarized as soon as their extraction finishes; failures are recorded as they come.
+        for file_name, result in file_handler.iter_batch_extract_text(
+                batch.folder_path, workers=current_app.config['BATCH_WORKERS'],
+                timeout=current_app.config['BATCH_FILE_TIMEOUT'], memory_limit=current_app.config['BATCH_FILE_MEMORY_LIMIT']):
+            entry = files.get(file_name)
+            if entry is None:
+                continue
+            if not result.ok:
+                fail(entry, f"Text extraction failed: {result.error}")
+            else:
+                yield file_name, result.text
+
+    def store_summary(file_name, summary_text, error):
+        entry = files[file_name]
+        if error is not None:
+            fail(entry, f"Summary generation failed: {error}")
+        elif not summary_text or summary_text.startswith("No valid") or len(summary_text.strip()) < 20:
+            fail(entry, f"Summary generation failed: {summary_text[:100] if summary_text else 'No summary'}...")
+        else:
+            summary = summary_repository.add(user_id=batch.user_id, file_name=file_name, summary_text=summary_text,
+                                             content_hash=entry.content_hash, parameters=parameters)
+            entry.status = JOB_DONE
+            entry.summary_id = summary.id
+            summarized.append(file_name)
+            queue.update(batch, files_done=batch.files_done + 1)
+
+    summarizer.batch_summarization(extracted_texts(), batch.summary_type, batch.num_sentences, batch.max_length,
+                                   workers=current_app.config['BATCH_WORKERS'], failures={}, on_result=store_summary)
+    queue.update(batch, status=JOB_DONE, files_done=batch.files_total,
+                 message=f"{len(summarized)} of {batch.files_total} files summarized")
+
+@bp.route("/login", methods=["GET", "POST"])
 def login():
     if request.method == "POST":
         username = request.form["username"]
@@ -54,11 +292,11 @@ def login():
         if user and check_password_hash(user.password, password):
             session["user_id"] = user.id
             flash("Login successful!", "success")
-            return redirect(url_for("upload_page"))
+            return redirect(url_for("main.upload_page"))
         flash("Invalid credentials", "error")
     return render_template("login.html")
 
-@app.route("/register", methods=["GET", "POST"])
+@bp.route("/register", methods=["GET", "POST"])
 def register():
     if request.method == "POST":
         username = request.form["username"]
@@ -66,37 +304,39 @@ def register():
         confirm_password = request.form["confirm_password"]
         if password != confirm_password:
             flash("Passwords do not match", "error")
-            return redirect(url_for("register"))
+            return redirect(url_for("main.register"))
         if User.query.filter_by(username=username).first():
             flash("Username exists", "error")
-            return redirect(url_for("register"))
+            return redirect(url_for("main.register"))
         user = User(username=username, password=generate_password_hash(password))
         db.session.add(user)
         db.session.commit()
         flash("Registration successful! Please login.", "success")
-        return redirect(url_for("login"))
+        return redirect(url_for("main.login"))
     return render_template("register.html")
 
-@app.route("/logout")
+@bp.route("/logout")
 def logout():
     session.pop("user_id", None)
     flash("Logged out", "info")
-    return redirect(url_for("login"))
+    return redirect(url_for("main.login"))
 
 def allowed_file(filename):
-    return '.' in filename and os.path.splitext(filename)[1].lower() in app.config['UPLOAD_EXTENSIONS']
+    return '.' in filename and os.path.splitext(filename)[1].lower() in current_app.config['UPLOAD_EXTENSIONS']
 
-@app.route("/", methods=["GET", "POST"])
+@bp.route("/", methods=["GET", "POST"])
 def upload_page():
     if "user_id" not in session:
-        return redirect(url_for("login"))
-
-    summaries = Summary.query.filter_by(user_id=session["user_id"]).all()
+        return redirect(url_for("main.login"))
 
     if request.method == "POST":
         summary_type = request.form.get("summary_type", "extractive")
         num_sentences = int(request.form.get("num_sentences", 5) or 5)
         max_length = int(request.form.get("max_length", 150) or 150)
+        pdf_backend = request.form.get("pdf_backend") or current_app.config['PDF_BACKEND']
+        if pdf_backend != "auto" and pdf_backend not in file_handler.PDF_BACKENDS:
+            # Unknown or uninstalled backends fall back to the configured default
+            pdf_backend = current_app.config['PDF_BACKEND']
 
         if "file" not in request.files or not request.files["file"].filename:
             flash("No file selected", "error")
@@ -108,62 +348,253 @@ def upload_page():
             return redirect(request.url)
 
         filename = secure_filename(file.filename)
-        upload_dir = os.path.join(app.instance_path, 'uploads')
-        os.makedirs(upload_dir, exist_ok=True)
-        file_path = os.path.join(upload_dir, filename)
-        file.save(file_path)
-
-        text = None
-        if filename.endswith('.pdf'):
-            text = file_handler.extract_text_from_pdf(file_path)
-        elif filename.endswith('.docx'):
-            text = file_handler.extract_text_from_docx(file_path)
-        elif filename.endswith('.txt'):
-            text = file_handler.extract_text_from_txt(file_path)
-
-        print(f"Extracted text (first 300 chars): {text[:300] if text else 'None'}")
-        if not text or text.startswith("Error") or len(text.strip()) < 20:
-            flash(f"Text extraction failed: {text[:100] if text else 'No text'}...", "error")
+        stream = file.stream
+        extension = os.path.splitext(filename)[1].lower()
+        if stream.file_type() != extension:
+            flash(f"File content does not match its {extension} extension", "error")
             return redirect(request.url)
+        digest = stream.hexdigest()
 
-        try:
-            if summary_type == "abstractive":
-                summary_text = summarizer.abstractive_summary(text, max_length)
-            else:
-                summary_text = summarizer.extractive_summary(text, num_sentences)
-            
-            print(f"Summary (first 300 chars): {summary_text[:300] if summary_text else 'None'}")
-            if not summary_text or summary_text.startswith("No valid") or len(summary_text.strip()) < 20:
-                flash(f"Summary generation failed: {summary_text[:100] if summary_text else 'No summary'}...", "error")
-                return redirect(request.url)
-
-            new_summary = Summary(user_id=session["user_id"], file_name=filename, summary_text=summary_text)
-            db.session.add(new_summary)
-            db.session.commit()
+        job_id = job_queue().new_job_id()
+        existing = summary_repository.find_by_content(session["user_id"], digest,
+                                                      summary_parameters(summary_type, num_sentences, max_length))
+        if existing is not None:
+            # Same bytes summarized with the same settings before: reuse it without parsing the file.
+            job = job_queue().create(id=job_id, user_id=session["user_id"], file_name=filename, file_path="",
+                                     content_hash=digest, summary_type=summary_type, num_sentences=num_sentences,
+                                     max_length=max_length, pdf_backend=pdf_backend)
+            job_queue().update(job, status=JOB_DONE, summary_id=existing.id,
+                               message="File processed successfully (already summarized)!")
+        else:
+            file_path = os.path.join(current_app.config['UPLOAD_DIR'], f"{job_id}_{filename}")
+            stream.keep(file_path)
+            job = job_queue().create(id=job_id, user_id=session["user_id"], file_name=filename, file_path=file_path,
+                                     content_hash=digest, summary_type=summary_type, num_sentences=num_sentences,
+                                     max_length=max_length, pdf_backend=pdf_backend)
+            job_queue().submit(job.id)
 
-            summaries_dict = {filename: summary_text}
-            flash("File processed successfully!", "success")
-            return render_template("results.html", summaries=summaries_dict, filename=filename)
+        if request.accept_mimetypes.best == "application/json":
+            return jsonify(job_status(job)), 202
+        return redirect(url_for("main.job_page", job_id=job.id))
 
-        except Exception as e:
-            print(f"Error processing file: {str(e)}\n{traceback.format_exc()}")
-            flash(f"Error generating summary: {str(e)}", "error")
-            return redirect(request.url)
+    before_id = request.args.get("before", type=int)
+    summaries, next_before = summary_repository.history_page(session["user_id"], before_id,
+                                                            current_app.config['HISTORY_PAGE_SIZE'],
+                                                            current_app.config['HISTORY_PREVIEW_CHARS'])
+    return render_template("upload.html", summaries=summaries, next_before=next_before, before_id=before_id,
+                           pdf_backends=file_handler.PDF_BACKENDS)
+
+@bp.route("/summaries/<int:summary_id>")
+def summary_detail(summary_id):
+    if "user_id" not in session:
+        return jsonify({"error": "Login required"}), 401
+    summary = summary_repository.get_for_user(summary_id, session["user_id"])
+    if summary is None:
+        return jsonify({"error": "Summary not found"}), 404
+    return jsonify({"id": summary.id, "file_name": summary.file_name, "summary_text": summary.summary_text})
+
+def job_status(job):
+    """JSON-serializable status of an upload job."""
+    if job.status == JOB_DONE:
+        progress = 1.0
+    elif job.pages_total:
+        progress = job.pages_done / job.pages_total
+    else:
+        progress = 0.0
+    return {
+        "job_id": job.id,
+        "file_name": job.file_name,
+        "status": job.status,
+        "pages_done": job.pages_done,
+        "pages_total": job.pages_total,
+        "progress": progress,
+        "message": job.message,
+        "status_url": url_for("main.job_status_api", job_id=job.id),
+        "result_url": url_for("main.job_result", job_id=job.id) if job.status == JOB_DONE else None,
+    }
 
-    return render_template("upload.html", summaries=summaries)
+def get_user_job(job_id):
+    """The current user's job, or None."""
+    return Job.query.filter_by(id=job_id, user_id=session.get("user_id")).first()
+
+@bp.route("/jobs/<job_id>")
+def job_status_api(job_id):
+    if "user_id" not in session:
+        return jsonify({"error": "Login required"}), 401
+    job = get_user_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    job_queue().expire_stale(job)
+    return jsonify(job_status(job))
+
+@bp.route("/jobs/<job_id>/view")
+def job_page(job_id):
+    if "user_id" not in session:
+        return redirect(url_for("main.login"))
+    job = get_user_job(job_id)
+    if job is None:
+        return render_template('404.html'), 404
+    return render_template("job.html", job=job_status(job))
+
+@bp.route("/jobs/<job_id>/result")
+def job_result(job_id):
+    if "user_id" not in session:
+        return redirect(url_for("main.login"))
+    job = get_user_job(job_id)
+    if job is None:
+        return render_template('404.html'), 404
+    if job.status == JOB_FAILED:
+        flash(job.message or "Error processing file", "error")
+        return redirect(url_for("main.upload_page"))
+    if job.status != JOB_DONE:
+        return redirect(url_for("main.job_page", job_id=job.id))
+    summary = db.session.get(Summary, job.summary_id)
+    flash(job.message, "success")
+    return render_template("results.html", summaries={job.file_name: summary.summary_text}, filename=job.file_name)
+
+@bp.route("/batches", methods=["POST"])
+def create_batch():
+    """Accept many files and/or ZIP archives as one batch, summarized in the background."""
+    if "user_id" not in session:
+        return redirect(url_for("main.login"))
+    wants_json = request.accept_mimetypes.best == "application/json"
+    uploads = [upload for upload in request.files.getlist("files") if upload.filename]
+    if not uploads:
+        if wants_json:
+            return jsonify({"error": "No files selected"}), 400
+        flash("No files selected", "error")
+        return redirect(url_for("main.upload_page"))
+
+    batch_id = batch_queue().new_job_id()
+    folder_path = os.path.join(current_app.config['UPLOAD_DIR'], f"batch_{batch_id}")
+    os.makedirs(folder_path)
+    max_files = current_app.config['BATCH_MAX_FILES']
+    max_bytes = current_app.config['BATCH_MAX_BYTES']
+    batch_bytes = 0
+    entries = []
+    for upload in uploads:
+        filename = secure_filename(upload.filename)
+        extension = os.path.splitext(filename)[1].lower()
+        stream = upload.stream
+        if extension in current_app.config['BATCH_EXTENSIONS'] and stream.header.startswith(file_handler.ZIP_SIGNATURE):
+            zip_path = os.path.join(folder_path, f".{filename}")
+            stream.keep(zip_path)
+            try:
+                files, skipped = file_handler.extract_zip(zip_path, folder_path, current_app.config['UPLOAD_EXTENSIONS'],
+                                                          max_files - len(entries), max_bytes - batch_bytes)
+                batch_bytes += sum(os.path.getsize(os.path.join(folder_path, name)) for name, _ in files)
+            except ValueError as e:
+                files, skipped = [], [(filename, str(e))]
+            finally:
+                os.remove(zip_path)
+            entries.extend(BatchFile(file_name=name, content_hash=digest, status=JOB_QUEUED) for name, digest in files)
+            entries.extend(BatchFile(file_name=name[:255], status=JOB_FAILED, message=reason) for name, reason in skipped)
+        elif not allowed_file(filename) or stream.file_type() != extension:
+            entries.append(BatchFile(file_name=(filename or upload.filename)[:255], status=JOB_FAILED,
+                                     message="Unsupported file type or content"))
+        elif len(entries) >= max_files:
+            entries.append(BatchFile(file_name=filename, status=JOB_FAILED, message=f"Batch limit of {max_files} files reached"))
+        elif batch_bytes + stream.size > max_bytes:
+            entries.append(BatchFile(file_name=filename, status=JOB_FAILED,
+                                     message=f"Batch size limit of {max_bytes // (1024 * 1024)}MB reached"))
+        else:
+            file_path = file_handler.unique_path(folder_path, filename)
+            stream.keep(file_path)
+            batch_bytes += stream.size
+            entries.append(BatchFile(file_name=os.path.basename(file_path), content_hash=stream.hexdigest(),
+                                     status=JOB_QUEUED))
+
+    summary_type = request.form.get("summary_type", "extractive")
+    num_sentences = int(request.form.get("num_sentences", 5) or 5)
+    max_length = int(request.form.get("max_length", 150) or 150)
+    batch = batch_queue().create(id=batch_id, user_id=session["user_id"], folder_path=folder_path,
+                                 summary_type=summary_type, num_sentences=num_sentences, max_length=max_length,
+                                 files_total=len(entries),
+                                 files_done=sum(1 for entry in entries if entry.status == JOB_FAILED))
+    for entry in entries:
+        entry.batch_id = batch.id
+    db.session.add_all(entries)
+    db.session.commit()
+    if any(entry.status == JOB_QUEUED for entry in entries):
+        batch_queue().submit(batch.id)
+    else:
+        batch_queue().update(batch, status=JOB_FAILED, message="No supported documents in the upload")
+
+    if wants_json:
+        return jsonify(batch_status(batch)), 202
+    return redirect(url_for("main.batch_page", batch_id=batch.id))
+
+def batch_status(batch):
+    """JSON-serializable status of a batch upload, with one entry per file."""
+    files = BatchFile.query.filter_by(batch_id=batch.id).order_by(BatchFile.id)
+    return {
+        "batch_id": batch.id,
+        "status": batch.status,
+        "files_total": batch.files_total,
+        "files_done": batch.files_done,
+        "progress": batch.files_done / batch.files_total if batch.files_total else 1.0,
+        "message": batch.message,
+        "status_url": url_for("main.batch_status_api", batch_id=batch.id),
+        "files": [{
+            "file_name": entry.file_name,
+            "status": entry.status,
+            "message": entry.message,
+            "summary_url": url_for("main.summary_detail", summary_id=entry.summary_id) if entry.summary_id else None,
+        } for entry in files],
+    }
+
+def get_user_batch(batch_id):
+    """The current user's batch, or None."""
+    return Batch.query.filter_by(id=batch_id, user_id=session.get("user_id")).first()
+
+@bp.route("/batches/<batch_id>")
+def batch_status_api(batch_id):
+    if "user_id" not in session:
+        return jsonify({"error": "Login required"}), 401
+    batch = get_user_batch(batch_id)
+    if batch is None:
+        return jsonify({"error": "Batch not found"}), 404
+    batch_queue().expire_stale(batch)
+    return jsonify(batch_status(batch))
+
+@bp.route("/batches/<batch_id>/view")
+def batch_page(batch_id):
+    if "user_id" not in session:
+        return redirect(url_for("main.login"))
+    batch = get_user_batch(batch_id)
+    if batch is None:
+        return render_template('404.html'), 404
+    return render_template("batch.html", batch=batch_status(batch))
+
+@bp.route("/healthz")
+def healthz():
+    report = startup.check_readiness(current_app.config['READINESS_MARKER'])
+    return jsonify(report), 200 if report["ready"] else 503
+
+@bp.route("/cache/stats")
+def cache_stats():
+    """Summary cache statistics for logged-in users.
+
+    Hit, miss and eviction counters are per worker process, so under gunicorn each
+    request reports the worker that served it.
+    """
+    if "user_id" not in session:
+        return jsonify({"error": "Login required"}), 401
+    return jsonify(summary_cache().stats())
 
-@app.errorhandler(404)
+@bp.app_errorhandler(404)
 def page_not_found(e):
     return render_template('404.html'), 404
 
-@app.errorhandler(413)
+@bp.app_errorhandler(413)
 def file_too_large(e):
-    flash("File too large (max 16MB)", "error")
-    return redirect(url_for('upload_page'))
+    flash(f"File too large (max {current_app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)}MB)", "error")
+    return redirect(url_for('main.upload_page'))
 
-def initialize_database():
+def initialize_database(app):
     with app.app_context():
         db.create_all()
+        run_migrations(db.engine)
         if not User.query.first():
             demo_user = User(username="demo", password=generate_password_hash("demo123"))
             db.session.add(demo_user)
@@ -172,9 +603,16 @@ def initialize_database():
 
 if __name__ == "__main__":
     try:
-        initialize_database()
+        app = create_app()
+        readiness = startup.check_readiness(app.config['READINESS_MARKER'], download=True, install=True)
+        for error in readiness["errors"]:
+            print(f"WARNING: {error}")
+        initialize_database(app)
+        startup.warmup()
+        app.extensions['job_queue'].resume_pending()
+        app.extensions['batch_queue'].resume_pending()
         print("Starting Flask app...")
-        app.run(debug=True, port=5000)
+        app.run(debug=os.environ.get("FLASK_DEBUG") == "1", port=int(os.environ.get("PORT", 5000)))
     except Exception as e:
         print(f"Error starting app: {str(e)}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -0,0 +1,13 @@
+"""
+WSGI entry point for production servers.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Creates the application from the environment (SECRET_KEY, DATABASE_URL) and brings the
+database schema up to date once, before any worker starts serving requests.
+"""
+
+from web_app import create_app, initialize_database
+
+app = create_app()
+initialize_database(app)